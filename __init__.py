@@ -22,25 +22,119 @@ from bpy.props import (
     FloatProperty,
     EnumProperty,
 )
+# Imported eagerly, also in background mode: the helpers provide the
+# `filepath` property that scripted bpy.ops.import_scene/export_scene.vox()
+# calls rely on, and Blender has already loaded bpy_extras at startup.
 from bpy_extras.io_utils import ExportHelper, ImportHelper
+import contextlib
 import os
+import traceback
 
-# Import our modules
-if "bpy" in locals():
+# Our modules are imported on first use (see the operators below) so that
+# enabling the addon does not pay for loading the import/export code.
+# During development (BLENDER2VOX_DEV set), reload any that were already
+# loaded when the addon is reloaded.
+if os.environ.get("BLENDER2VOX_DEV"):
     import importlib
-    if "vox_exporter" in locals():
-        importlib.reload(vox_exporter)
-    if "vox_writer" in locals():
-        importlib.reload(vox_writer)
-    if "vox_reader" in locals():
-        importlib.reload(vox_reader)
-    if "vox_importer" in locals():
-        importlib.reload(vox_importer)
+    import sys
+    for _name in ("vox_reader", "vox_writer", "vox_mesher", "vox_importer", "vox_exporter"):
+        _module = sys.modules.get(f"{__name__}.{_name}")
+        if _module is not None:
+            importlib.reload(_module)
 
-from . import vox_exporter
-from . import vox_writer
-from . import vox_reader
-from . import vox_importer
+
+# Shared, immutable property data (reused as-is across addon reloads)
+_VOX_FILTER = "*.vox"
+
+# bpy.props return deferred descriptors, so one can back both operators
+_VOX_FILTER_PROP = StringProperty(
+    default=_VOX_FILTER,
+    options={'HIDDEN'},
+    maxlen=255,
+)
+
+_PALETTE_ITEMS = (
+    ('AUTO', "Auto Generate", "Automatically generate palette from mesh colors"),
+    ('QUANTIZE', "Quantize Colors", "Reduce colors to fit in 255 palette entries"),
+)
+
+
+class _ReportStatus:
+    """Outcome of an operator body run under _report_errors()."""
+    cancelled = False
+
+
+@contextlib.contextmanager
+def _report_errors(op: bpy.types.Operator, action: str):
+    """Report any exception raised in the block as an operator error.
+
+    Usage:
+        with _report_errors(self, "Import") as status:
+            ...
+        return {'CANCELLED'} if status.cancelled else {'FINISHED'}
+    """
+    status = _ReportStatus()
+    try:
+        yield status
+    except Exception as e:
+        op.report({'ERROR'}, f"{action} failed: {e}")
+        traceback.print_exc()
+        status.cancelled = True
+
+
+# Mesh objects of the scene last queried, dropped whenever the depsgraph
+# reports changes so that scene.objects is only rescanned after an edit.
+# Only used by the export dialog, where a stale result is harmless
+_mesh_objects_cache = None
+_cache_scene_id = None
+
+# Bumped by the same handlers, so callers can tell with one comparison
+# whether anything, including the selection, may have changed
+_update_generation = 0
+
+
+@bpy.app.handlers.persistent
+def _invalidate_mesh_objects_cache(*args):
+    global _mesh_objects_cache, _update_generation
+    _mesh_objects_cache = None
+    _update_generation += 1
+
+
+_CACHE_INVALIDATING_HANDLERS = (
+    bpy.app.handlers.depsgraph_update_post,
+    bpy.app.handlers.undo_post,
+    bpy.app.handlers.redo_post,
+    bpy.app.handlers.load_post,
+)
+
+
+def _scene_mesh_objects(scene: bpy.types.Scene) -> tuple:
+    """Return the mesh objects of a scene, cached until the next update."""
+    global _mesh_objects_cache, _cache_scene_id
+    scene_id = scene.as_pointer()
+    if _mesh_objects_cache is None or _cache_scene_id != scene_id:
+        _mesh_objects_cache = tuple(obj for obj in scene.objects if obj.type == 'MESH')
+        _cache_scene_id = scene_id
+    return _mesh_objects_cache
+
+
+# Bits of IMPORT_OT_vox.import_flags, matching vox_importer.IMPORT_* flags
+_IMPORT_CREATE_MATERIALS = 1 << 0
+_IMPORT_VERTEX_COLORS = 1 << 1
+
+
+def _import_flag_property(bit: int, **kwargs):
+    """BoolProperty that reads and writes one bit of import_flags."""
+    def _get(self):
+        return bool(self.import_flags & bit)
+
+    def _set(self, value):
+        if value:
+            self.import_flags |= bit
+        else:
+            self.import_flags &= ~bit
+
+    return BoolProperty(get=_get, set=_set, **kwargs)
 
 
 class IMPORT_OT_vox(bpy.types.Operator, ImportHelper):
@@ -50,11 +144,7 @@ class IMPORT_OT_vox(bpy.types.Operator, ImportHelper):
     bl_options = {'PRESET', 'UNDO'}
 
     filename_ext = ".vox"
-    filter_glob: StringProperty(
-        default="*.vox",
-        options={'HIDDEN'},
-        maxlen=255,
-    )
+    filter_glob: _VOX_FILTER_PROP
 
     # Import options
     scale: FloatProperty(
@@ -65,39 +155,41 @@ class IMPORT_OT_vox(bpy.types.Operator, ImportHelper):
         max=10.0,
     )
 
-    create_materials: BoolProperty(
+    # Packed boolean import options, see _IMPORT_* bits
+    import_flags: IntProperty(
+        default=_IMPORT_CREATE_MATERIALS | _IMPORT_VERTEX_COLORS,
+        options={'HIDDEN'},
+    )
+
+    create_materials: _import_flag_property(
+        _IMPORT_CREATE_MATERIALS,
         name="Create Materials",
         description="Create a material that uses vertex colors",
-        default=True,
     )
 
-    use_vertex_colors: BoolProperty(
+    use_vertex_colors: _import_flag_property(
+        _IMPORT_VERTEX_COLORS,
         name="Apply Vertex Colors",
         description="Apply colors from palette as vertex colors",
-        default=True,
     )
 
     def execute(self, context):
-        try:
+        from . import vox_importer
+
+        with _report_errors(self, "Import") as status:
             obj = vox_importer.import_vox(
                 filepath=self.filepath,
                 scale=self.scale,
-                create_materials=self.create_materials,
-                use_vertex_colors=self.use_vertex_colors,
+                flags=self.import_flags,
             )
 
             # Set a nice name based on filename
-            name = os.path.splitext(os.path.basename(self.filepath))[0]
+            name = os.path.basename(self.filepath).rsplit('.', 1)[0]
             obj.name = name
 
             self.report({'INFO'}, f"Imported {self.filepath}")
-            return {'FINISHED'}
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Import failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return {'CANCELLED'}
+        return {'CANCELLED'} if status.cancelled else {'FINISHED'}
 
     def draw(self, context):
         layout = self.layout
@@ -111,6 +203,18 @@ class IMPORT_OT_vox(bpy.types.Operator, ImportHelper):
         box.prop(self, "use_vertex_colors")
 
 
+# (label, icon, properties) of each export dialog section, in draw order.
+# The voxelization section must stay first, see EXPORT_OT_vox.draw().
+_EXPORT_SECTIONS = (
+    ("Voxelization Settings", 'MESH_GRID',
+     ("voxel_size", "max_size", "ray_samples", "fill_interior")),
+    ("Color Settings", 'COLOR',
+     ("use_vertex_colors", "use_material_colors", "palette_mode")),
+    ("Transform Settings", 'OBJECT_DATA',
+     ("center_model", "apply_transforms", "export_selected_only")),
+)
+
+
 class EXPORT_OT_vox(bpy.types.Operator, ExportHelper):
     """Export selected objects to MagicaVoxel .vox format"""
     bl_idname = "export_scene.vox"
@@ -118,11 +222,7 @@ class EXPORT_OT_vox(bpy.types.Operator, ExportHelper):
     bl_options = {'PRESET', 'UNDO'}
 
     filename_ext = ".vox"
-    filter_glob: StringProperty(
-        default="*.vox",
-        options={'HIDDEN'},
-        maxlen=255,
-    )
+    filter_glob: _VOX_FILTER_PROP
 
     # Export options
     voxel_size: FloatProperty(
@@ -188,10 +288,7 @@ class EXPORT_OT_vox(bpy.types.Operator, ExportHelper):
     palette_mode: EnumProperty(
         name="Palette Mode",
         description="How to generate the color palette",
-        items=[
-            ('AUTO', "Auto Generate", "Automatically generate palette from mesh colors"),
-            ('QUANTIZE', "Quantize Colors", "Reduce colors to fit in 255 palette entries"),
-        ],
+        items=_PALETTE_ITEMS,
         default='QUANTIZE',
     )
 
@@ -201,18 +298,52 @@ class EXPORT_OT_vox(bpy.types.Operator, ExportHelper):
         default=True,
     )
 
+    # Cached result of the VOX metadata scan and the state it was made in
+    _meta_cache = None
+    _sel_sig = None
+
+    def _has_vox_metadata(self, context) -> bool:
+        """Check whether any mesh to be exported carries VOX metadata.
+
+        draw() runs on every redraw of the export dialog, so the scan is
+        only repeated after a depsgraph update (which selection changes
+        also cause), a scene switch or a change of export_selected_only.
+        Checking for that is O(1), so unchanged redraws do not touch the
+        objects at all.
+        """
+        selected_only = self.export_selected_only
+        sig = (selected_only, context.scene.as_pointer(), _update_generation)
+
+        if sig != self._sel_sig:
+            if selected_only:
+                meshes = (obj for obj in context.selected_objects if obj.type == 'MESH')
+            else:
+                meshes = _scene_mesh_objects(context.scene)
+
+            from . import vox_importer
+            prop = vox_importer.VOX_METADATA_PROP
+            # Probe lazily and stop at the first hit.
+            # ID-property .get() is a direct lookup, cheaper than `in`.
+            self._meta_cache = any(obj.get(prop) is not None for obj in meshes)
+            self._sel_sig = sig
+        return self._meta_cache
+
     def execute(self, context):
-        # Collect objects to export
+        # Collect objects to export. Scripts can change the scene without a
+        # depsgraph update, so unlike draw() this always scans afresh
         if self.export_selected_only:
-            objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+            candidates = context.selected_objects
         else:
-            objects = [obj for obj in context.scene.objects if obj.type == 'MESH']
+            candidates = context.scene.objects
+        objects = tuple(obj for obj in candidates if obj.type == 'MESH')
 
         if not objects:
             self.report({'ERROR'}, "No mesh objects to export")
             return {'CANCELLED'}
 
-        try:
+        from . import vox_exporter
+
+        with _report_errors(self, "Export") as status:
             # Create exporter
             exporter = vox_exporter.VoxExporter(
                 voxel_size=self.voxel_size,
@@ -231,71 +362,51 @@ class EXPORT_OT_vox(bpy.types.Operator, ExportHelper):
             exporter.export(objects, self.filepath)
 
             self.report({'INFO'}, f"Exported to {self.filepath}")
-            return {'FINISHED'}
 
-        except Exception as e:
-            self.report({'ERROR'}, f"Export failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return {'CANCELLED'}
+        return {'CANCELLED'} if status.cancelled else {'FINISHED'}
 
     def draw(self, context):
         layout = self.layout
         layout.use_property_split = True
         layout.use_property_decorate = False
 
-        # Check if any selected objects have VOX metadata
-        has_vox_metadata = False
-        if self.export_selected_only:
-            objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
-        else:
-            objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+        # Read once; each property access goes through RNA
+        preserve = self.preserve_vox_data
 
-        for obj in objects:
-            if vox_importer.VOX_METADATA_PROP in obj:
-                has_vox_metadata = True
-                break
+        # Check if any selected objects have VOX metadata
+        has_vox_metadata = self._has_vox_metadata(context)
 
         # Round-trip settings (show prominently if VOX data detected)
         if has_vox_metadata:
             box = layout.box()
             box.label(text="VOX Data Detected", icon='INFO')
             box.prop(self, "preserve_vox_data")
-            if self.preserve_vox_data:
+            if preserve:
                 box.label(text="Will use original voxel positions", icon='CHECKMARK')
 
-        # Voxelization settings (only relevant if not preserving VOX data)
-        box = layout.box()
-        box.label(text="Voxelization Settings", icon='MESH_GRID')
-        if has_vox_metadata and self.preserve_vox_data:
-            box.enabled = False
-            box.label(text="(Disabled when preserving VOX data)")
-        box.prop(self, "voxel_size")
-        box.prop(self, "max_size")
-        box.prop(self, "ray_samples")
-        box.prop(self, "fill_interior")
-
-        # Color settings
-        box = layout.box()
-        box.label(text="Color Settings", icon='COLOR')
-        box.prop(self, "use_vertex_colors")
-        box.prop(self, "use_material_colors")
-        box.prop(self, "palette_mode")
+        # Voxelization settings are only relevant if not preserving VOX
+        # data, so skip building that section entirely in that case
+        sections = _EXPORT_SECTIONS
+        if has_vox_metadata and preserve:
+            sections = sections[1:]
+
+        for label, icon, props in sections:
+            box = layout.box()
+            box.label(text=label, icon=icon)
+            for prop in props:
+                box.prop(self, prop)
 
-        # Transform settings
-        box = layout.box()
-        box.label(text="Transform Settings", icon='OBJECT_DATA')
-        box.prop(self, "center_model")
-        box.prop(self, "apply_transforms")
-        box.prop(self, "export_selected_only")
+
+_EXPORT_IDNAME = EXPORT_OT_vox.bl_idname
+_IMPORT_IDNAME = IMPORT_OT_vox.bl_idname
 
 
 def menu_func_export(self, context):
-    self.layout.operator(EXPORT_OT_vox.bl_idname, text="MagicaVoxel (.vox)")
+    self.layout.operator(_EXPORT_IDNAME, text="MagicaVoxel (.vox)")
 
 
 def menu_func_import(self, context):
-    self.layout.operator(IMPORT_OT_vox.bl_idname, text="MagicaVoxel (.vox)")
+    self.layout.operator(_IMPORT_IDNAME, text="MagicaVoxel (.vox)")
 
 
 classes = (
@@ -304,18 +415,25 @@ classes = (
 )
 
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
+
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
     bpy.types.TOPBAR_MT_file_export.append(menu_func_export)
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    for handlers in _CACHE_INVALIDATING_HANDLERS:
+        handlers.append(_invalidate_mesh_objects_cache)
 
 
 def unregister():
+    for handlers in _CACHE_INVALIDATING_HANDLERS:
+        if _invalidate_mesh_objects_cache in handlers:
+            handlers.remove(_invalidate_mesh_objects_cache)
+    _invalidate_mesh_objects_cache()
     bpy.types.TOPBAR_MT_file_export.remove(menu_func_export)
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    _unregister_classes()
 
 
 if __name__ == "__main__":
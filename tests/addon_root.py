@@ -0,0 +1,21 @@
+"""
+Pytest plugin that keeps the add-on package out of test collection
+
+The repository root is the add-on package, so pytest would collect it as a
+package and import its __init__.py, which needs bpy. The root is collected
+as a plain directory instead. This is loaded with -p from pytest.ini,
+because a conftest.py in the root would itself be imported as part of the
+package.
+"""
+
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pytest_collect_directory(path, parent):
+    if str(path) == ROOT:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,11 @@
+"""
+Test configuration
+
+The add-on package imports bpy, but vox_reader, vox_writer and vox_mesher
+do not, so they are imported as top-level modules from the repository root.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
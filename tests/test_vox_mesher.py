@@ -0,0 +1,57 @@
+"""Tests for vox_mesher"""
+
+import numpy as np
+import pytest
+
+import vox_mesher
+
+
+def _random_grid(seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    size = rng.integers(1, 7, 3)
+    count = int(rng.integers(1, 120))
+    voxels = np.column_stack([rng.integers(0, size[i], count) for i in range(3)]
+                             + [rng.integers(1, 4, count)])
+    return vox_mesher.voxel_grid(voxels, tuple(size.tolist()))
+
+
+def _max_quads(grid: np.ndarray) -> int:
+    solid = grid != 0
+    return sum(int(np.count_nonzero(np.diff(solid, axis=axis))) for axis in range(3))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_loop_and_numpy_paths_agree(seed):
+    grid = _random_grid(seed)
+    max_quads = _max_quads(grid)
+    # Called uncompiled, so this checks the loop code itself
+    loop_quads, loop_colors = vox_mesher._greedy_quads_loop(grid, max_quads)
+    numpy_quads, numpy_colors = vox_mesher._greedy_quads_numpy(grid, max_quads)
+    assert loop_quads.shape == numpy_quads.shape
+    assert (loop_quads == numpy_quads).all()
+    assert (loop_colors == numpy_colors).all()
+
+
+def test_single_voxel_is_a_unit_cube():
+    grid = vox_mesher.voxel_grid([(0, 0, 0, 3)], (1, 1, 1))
+    verts, loops, colors = vox_mesher.build_mesh(grid, 0.5)
+    assert len(colors) == 6
+    assert (colors == 3).all()
+    assert len(loops) == 24
+    assert len(verts) == 8
+    assert verts.min() == 0.0 and verts.max() == 0.5
+
+
+def test_oversized_size_is_clamped():
+    # A corrupt SIZE chunk must not size the grid
+    grid = vox_mesher.voxel_grid([(0, 0, 0, 1)], (100000,) * 3)
+    assert grid.shape == (258, 258, 258)
+    _, _, colors = vox_mesher.build_mesh(grid, 1.0)
+    assert len(colors) == 6
+
+
+def test_same_color_faces_merge():
+    # A 1x3x1 bar of one color needs one quad per side
+    grid = vox_mesher.voxel_grid([(0, y, 0, 1) for y in range(3)], (1, 3, 1))
+    quads, colors = vox_mesher.greedy_quads(grid)
+    assert len(quads) == 6
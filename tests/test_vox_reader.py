@@ -0,0 +1,44 @@
+"""Tests for vox_reader"""
+
+import struct
+
+import pytest
+
+import vox_reader
+
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "test.vox"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_rejects_bad_magic(tmp_path):
+    with pytest.raises(ValueError):
+        vox_reader.read_vox_scene(_write(tmp_path, b"RIFF" + bytes(16)))
+
+
+def test_rejects_empty_file(tmp_path):
+    with pytest.raises(ValueError):
+        vox_reader.read_vox_scene(_write(tmp_path, b""))
+
+
+def test_truncated_chunk_raises_value_error(tmp_path):
+    # SIZE chunk that claims 12 bytes of content but only has 2
+    data = (b"VOX " + struct.pack("<I", 150)
+            + b"MAIN" + struct.pack("<II", 0, 14)
+            + b"SIZE" + struct.pack("<II", 12, 0) + b"\0\0")
+    with pytest.raises(ValueError):
+        vox_reader.read_vox_scene(_write(tmp_path, data))
+
+
+def test_truncated_header_raises_value_error(tmp_path):
+    with pytest.raises(ValueError):
+        vox_reader.read_vox_scene(_write(tmp_path, b"VOX \x96"))
+
+
+def test_voxel_model_coerces_lists():
+    model = vox_reader.VoxModel(2, 2, 2, [(0, 0, 0, 1), (1, 1, 1, 2)])
+    assert model.voxels.dtype.name == "uint8"
+    assert model.voxels.shape == (2, 4)
+    assert model.voxel_tuples() == [(0, 0, 0, 1), (1, 1, 1, 2)]
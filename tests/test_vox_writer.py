@@ -0,0 +1,101 @@
+"""Tests for vox_writer"""
+
+import numpy as np
+import pytest
+
+import vox_writer
+
+
+def test_palette_colors_are_read_only():
+    palette = vox_writer.VoxPalette()
+    with pytest.raises(ValueError):
+        palette.colors[1] = (1, 2, 3, 255)
+    with pytest.raises(AttributeError):
+        palette.colors = np.zeros((256, 4), dtype=np.uint8)
+
+
+def test_set_color_refreshes_cached_rgba_chunk():
+    palette = vox_writer.VoxPalette()
+    before = palette.get_rgba_chunk().content
+    palette.set_color(1, 10, 20, 30, 40)
+    content = palette.get_rgba_chunk().content
+    assert content != before
+    assert content[:4] == bytes((10, 20, 30, 40))
+    assert len(content) == 1024
+    assert tuple(palette.colors[1]) == (10, 20, 30, 40)
+
+
+def test_add_voxel_validates_ranges():
+    model = vox_writer.VoxModel(4, 4, 4)
+    with pytest.raises(ValueError):
+        model.add_voxel(256, 0, 0, 1)
+    with pytest.raises(ValueError):
+        model.add_voxel(0, -1, 0, 1)
+    with pytest.raises(ValueError):
+        model.add_voxel(0, 0, 0, 0)
+    with pytest.raises(ValueError):
+        model.add_voxel(0, 0, 0, 256)
+    with pytest.raises(ValueError):
+        model.add_voxels([(0, 0, 0, 0)])
+    assert len(model.voxels) == 0
+
+
+def test_add_voxel_validates_numpy_unsigned():
+    model = vox_writer.VoxModel(4, 4, 4)
+    x, y, z = np.uint8(1), np.uint8(2), np.uint8(3)
+    with pytest.raises(ValueError):
+        model.add_voxel(x, y, z, np.uint8(0))
+    with pytest.raises(ValueError):
+        model.add_voxel(x, y, z, np.uint16(256))
+    with pytest.raises(ValueError):
+        model.add_voxel(np.uint16(256), y, z, np.uint8(1))
+    model.add_voxel(x, y, z, np.uint8(255))
+    assert model.voxels.tolist() == [[1, 2, 3, 255]]
+
+
+def test_round_trip_through_reader(tmp_path):
+    import vox_reader
+
+    model = vox_writer.VoxModel(3, 4, 5)
+    model.add_voxel(0, 1, 2, 5)
+    model.add_voxels([(2, 3, 4, 7), (1, 1, 1, 255)])
+
+    writer = vox_writer.VoxWriter()
+    index = writer.add_model(model)
+    writer.add_instance(index, (10, -3, 4), rotation=40, name="Thing")
+    writer.add_instance(index)
+    writer.palette.set_color(5, 1, 2, 3, 4)
+
+    path = str(tmp_path / "round_trip.vox")
+    writer.write(path)
+    scene = vox_reader.read_vox_scene(path)
+
+    assert len(scene.models) == 1
+    read = scene.models[0]
+    assert (read.size_x, read.size_y, read.size_z) == (3, 4, 5)
+    assert read.voxel_tuples() == [(0, 1, 2, 5), (2, 3, 4, 7), (1, 1, 1, 255)]
+    assert scene.instances == [(0, (10, -3, 4), 40, "Thing"), (0, (0, 0, 0), 0, "")]
+    # The reader's palette starts at color index 1
+    assert scene.palette[4] == (1, 2, 3, 4)
+    assert [tuple(c) for c in writer.palette.colors[1:]] == scene.palette[:255]
+
+
+def test_create_simple_vox_indexes_colors(tmp_path):
+    import vox_reader
+
+    path = str(tmp_path / "simple.vox")
+    vox_writer.create_simple_vox(
+        [(0, 0, 0, (255, 0, 0)), (1, 0, 0, (0, 255, 0)), (2, 0, 0, (255, 0, 0))], path
+    )
+    scene = vox_reader.read_vox_scene(path)
+
+    assert scene.models[0].voxel_tuples() == [(0, 0, 0, 1), (1, 0, 0, 2), (2, 0, 0, 1)]
+    assert scene.palette[:2] == [(255, 0, 0, 255), (0, 255, 0, 255)]
+
+
+def test_create_simple_vox_rejects_bad_colors(tmp_path):
+    path = str(tmp_path / "bad.vox")
+    with pytest.raises(ValueError):
+        vox_writer.create_simple_vox([(0, 0, 0, (256, 0, 0))], path)
+    with pytest.raises(ValueError):
+        vox_writer.create_simple_vox([(0, 0, 0, (0, -1, 0))], path)
@@ -11,35 +11,74 @@ This module handles:
 """
 
 import bpy
-import bmesh
 import mathutils
 from mathutils import Vector, Matrix
 from mathutils.bvhtree import BVHTree
-from typing import List, Tuple, Dict, Optional, Set
+from typing import List, Tuple, Dict, Optional, Sequence, Set
+import heapq
 import math
 from collections import defaultdict
 import json
+import logging
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, Blender does not bundle it
+    njit = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # SciPy is optional, Blender does not bundle it
+    cKDTree = None
 
 from . import vox_writer
 from . import vox_importer
 
+logger = logging.getLogger(__name__)
+
+
+def pack_rgb(colors) -> np.ndarray:
+    """Pack RGB colors into single uint32 keys (r << 16 | g << 8 | b).
+
+    Args:
+        colors: (..., 3) array-like of 0-255 color components
+
+    Returns:
+        Array of uint32 keys with the leading shape of colors
+    """
+    colors = np.asarray(colors, dtype=np.uint32)
+    return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+
+
+def unpack_rgb(keys) -> np.ndarray:
+    """Unpack uint32 keys from pack_rgb() into (..., 3) int64 colors."""
+    keys = np.asarray(keys, dtype=np.int64)
+    return np.stack(((keys >> 16) & 0xFF, (keys >> 8) & 0xFF, keys & 0xFF), axis=-1)
+
 
-def color_distance(c1: Tuple[int, int, int], c2: Tuple[int, int, int]) -> float:
-    """Calculate Euclidean distance between two RGB colors."""
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(c1, c2)))
+def color_distance_sq(c1: Tuple[int, int, int], c2: Tuple[int, int, int]) -> int:
+    """Calculate squared Euclidean distance between two RGB colors.
+
+    Enough for finding the closest color, as sqrt does not change the order.
+    """
+    return (c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2
 
 
 def quantize_colors(colors: List[Tuple[int, int, int]], max_colors: int = 255) -> Tuple[List[Tuple[int, int, int]], Dict[Tuple[int, int, int], int]]:
     """Quantize colors to fit within max_colors using median cut algorithm.
 
+    colors may be a list of (r, g, b) tuples or an (N, 3) array.
+
     Returns:
         Tuple of (palette list, color to index mapping)
     """
-    if not colors:
+    if not len(colors):
         # Return a default palette with visible gray
         return [(180, 180, 180)], {(180, 180, 180): 1}
 
-    unique_colors = list(set(colors))
+    unique_arr = unpack_rgb(np.unique(pack_rgb(colors)))
+    unique_colors = list(map(tuple, unique_arr.tolist()))
 
     if len(unique_colors) <= max_colors:
         # No quantization needed
@@ -47,63 +86,157 @@ def quantize_colors(colors: List[Tuple[int, int, int]], max_colors: int = 255) -
         color_to_index = {c: i + 1 for i, c in enumerate(palette)}
         return palette, color_to_index
 
-    # Simple median cut implementation
-    def median_cut(box: List[Tuple[int, int, int]], depth: int) -> List[Tuple[int, int, int]]:
-        if depth == 0 or len(box) <= 1:
-            # Return average color
-            if not box:
-                return [(180, 180, 180)]
-            r = sum(c[0] for c in box) // len(box)
-            g = sum(c[1] for c in box) // len(box)
-            b = sum(c[2] for c in box) // len(box)
-            return [(r, g, b)]
-
-        # Find dimension with largest range
-        r_range = max(c[0] for c in box) - min(c[0] for c in box)
-        g_range = max(c[1] for c in box) - min(c[1] for c in box)
-        b_range = max(c[2] for c in box) - min(c[2] for c in box)
-
-        if r_range >= g_range and r_range >= b_range:
-            sort_key = lambda c: c[0]
-        elif g_range >= b_range:
-            sort_key = lambda c: c[1]
-        else:
-            sort_key = lambda c: c[2]
+    palette_arr = _median_cut(unique_arr, max_colors)
+    palette = [tuple(c) for c in palette_arr.tolist()]
+
+    # Build mapping from original colors to closest palette indices
+    nearest = _nearest_palette_indices(unique_arr, palette_arr)
+    color_to_index = {c: i + 1 for c, i in zip(unique_colors, nearest.tolist())}  # VOX uses 1-based indexing
+
+    return palette, color_to_index
+
+
+def _median_cut(colors: np.ndarray, max_colors: int) -> np.ndarray:
+    """Split an (N, 3) color array into at most max_colors average colors.
+
+    The box with the largest squared error is always split next, at the
+    median of its widest channel, so splits go where the colors differ
+    most instead of to a fixed depth.
+    """
+    # Boxes are views into one reordered copy of the colors
+    colors = colors.copy()
+    heap = [(-_box_error(colors), 0, colors)]
+    pushed = 1
+
+    while len(heap) < max_colors and heap[0][0] < 0:
+        _, _, box = heapq.heappop(heap)
+
+        # Split at the median of the dimension with largest range
+        axis = int(np.ptp(box, axis=0).argmax())
+        mid = len(box) // 2
+        box[:] = box[np.argpartition(box[:, axis], mid)]
+
+        for child in (box[:mid], box[mid:]):
+            heapq.heappush(heap, (-_box_error(child), pushed, child))
+            pushed += 1
+
+    # Return average colors
+    return np.array([box.sum(axis=0) // len(box) for _, _, box in heap])
+
+
+def _box_error(box: np.ndarray) -> float:
+    """Sum of squared distances of the colors in a box to their mean."""
+    if len(box) <= 1:
+        return 0.0
+    return float(((box - box.mean(axis=0)) ** 2).sum())
+
+
+# Colors compared against the palette at once by the NumPy fallback
+_NEAREST_CHUNK = 4096
+
+
+def _nearest_palette_indices(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """Find the index of the closest palette color for each color.
+
+    Args:
+        colors: (N, 3) array of colors
+        palette: (P, 3) array of palette colors
 
-        sorted_box = sorted(box, key=sort_key)
-        mid = len(sorted_box) // 2
+    Returns:
+        (N,) array of 0-based palette indices
+    """
+    if cKDTree is not None:
+        _, indices = cKDTree(palette).query(colors)
+        return np.asarray(indices, dtype=np.int64)
+
+    colors = colors.astype(np.int64)
+    palette = palette.astype(np.int64)
+    indices = np.empty(len(colors), dtype=np.int64)
+    for start in range(0, len(colors), _NEAREST_CHUNK):
+        chunk = colors[start:start + _NEAREST_CHUNK]
+        dist = ((chunk[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+        indices[start:start + _NEAREST_CHUNK] = dist.argmin(axis=1)
+    return indices
+
+
+def build_auto_palette(colors: List[Tuple[int, int, int]], max_colors: int = 255) -> Tuple[List[Tuple[int, int, int]], Dict[Tuple[int, int, int], int]]:
+    """Build a palette from the exact mesh colors.
 
-        return median_cut(sorted_box[:mid], depth - 1) + median_cut(sorted_box[mid:], depth - 1)
+    Keeps the max_colors most frequent colors unchanged; any remaining
+    colors are mapped to their closest palette entry. colors may be a
+    list of (r, g, b) tuples or an (N, 3) array.
+
+    Returns:
+        Tuple of (palette list, color to index mapping)
+    """
+    if not len(colors):
+        # Return a default palette with visible gray
+        return [(180, 180, 180)], {(180, 180, 180): 1}
 
-    # Calculate depth needed
-    depth = int(math.log2(max_colors))
-    palette = median_cut(unique_colors, depth)
+    # Most frequent first, ties in order of first appearance
+    keys, first, counts = np.unique(pack_rgb(colors), return_index=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    unique_rgb = unpack_rgb(keys[order])
 
-    # Ensure we don't exceed max_colors
-    palette = palette[:max_colors]
+    palette = list(map(tuple, unique_rgb[:max_colors].tolist()))
+    color_to_index = {c: i + 1 for i, c in enumerate(palette)}
 
-    # Build mapping from original colors to palette indices
-    color_to_index = {}
-    for color in unique_colors:
-        # Find closest palette color
-        best_idx = 0
-        best_dist = float('inf')
-        for i, pc in enumerate(palette):
-            dist = color_distance(color, pc)
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = i
-        color_to_index[color] = best_idx + 1  # VOX uses 1-based indexing
+    # Map the remaining colors to their closest palette entry in one batch
+    if len(unique_rgb) > max_colors:
+        rest = unique_rgb[max_colors:]
+        nearest = _nearest_palette_indices(rest, unique_rgb[:max_colors]) + 1  # VOX uses 1-based indexing
+        color_to_index.update(zip(map(tuple, rest.tolist()), nearest.tolist()))
 
     return palette, color_to_index
 
 
+# Palette builder for each palette_mode, resolved once per exporter
+_PALETTE_BUILDERS = {
+    'AUTO': build_auto_palette,
+    'QUANTIZE': quantize_colors,
+}
+
+
+# Component of a normalized diagonal direction
+_DIAG = 1.0 / math.sqrt(3)
+
+
 class VoxExporter:
     """Main exporter class for converting Blender objects to VOX format."""
 
     # Default color for objects without any color data (visible light gray)
     DEFAULT_COLOR = (180, 180, 180)
 
+    # Ray directions shared by every voxel test
+    _AXIS_DIRECTIONS = (
+        Vector((1, 0, 0)), Vector((-1, 0, 0)),
+        Vector((0, 1, 0)), Vector((0, -1, 0)),
+        Vector((0, 0, 1)), Vector((0, 0, -1)),
+    )
+    _DIAGONAL_DIRECTIONS = (
+        Vector((_DIAG, _DIAG, _DIAG)), Vector((-_DIAG, -_DIAG, -_DIAG)),
+        Vector((_DIAG, -_DIAG, _DIAG)), Vector((-_DIAG, _DIAG, -_DIAG)),
+    )
+
+    # Cells per axis of the tiles used to skip empty space when filling
+    _INTERIOR_TILE = 8
+
+    # Settings are read in the per-voxel loops, slots keep those reads cheap
+    __slots__ = (
+        'voxel_size',
+        'max_size',
+        'use_vertex_colors',
+        'use_material_colors',
+        'center_model',
+        'apply_transforms',
+        'fill_interior',
+        'ray_samples',
+        'palette_mode',
+        'preserve_vox_data',
+        '_palette_fn',
+        '_material_colors',
+    )
+
     def __init__(self,
                  voxel_size: float = 0.1,
                  max_size: int = 126,
@@ -125,19 +258,28 @@ class VoxExporter:
         self.ray_samples = ray_samples
         self.palette_mode = palette_mode
         self.preserve_vox_data = preserve_vox_data
+        self._palette_fn = _PALETTE_BUILDERS[palette_mode]
+        # Material base colors by name_full, valid for one export() call
+        self._material_colors: Dict[str, Tuple[int, int, int]] = {}
 
-    def export(self, objects: List[bpy.types.Object], filepath: str):
+    def export(self, objects: Sequence[bpy.types.Object], filepath: str):
         """Export objects to VOX file.
 
         For multiple objects, each object becomes a separate model with its
         world position preserved in the scene graph.
         """
+        # Materials may have been edited since the last export
+        self._material_colors.clear()
+
         writer = vox_writer.VoxWriter()
         original_palette = None
         all_use_original_indices = True
 
         # Collect model data for each object
-        object_data = []  # List of (obj, voxels, uses_original_indices, palette)
+        # List of (obj, voxels, uses_original_indices, palette), where voxels
+        # holds x, y, z, color index rows for preserved data and
+        # x, y, z, r, g, b rows for voxelized meshes
+        object_data = []
 
         for obj in objects:
             # Check if this object has VOX metadata (was imported from VOX)
@@ -145,7 +287,7 @@ class VoxExporter:
                 metadata = vox_importer.get_vox_metadata(obj)
                 if metadata and 'voxels' in metadata and metadata.get('palette'):
                     print(f"Using preserved VOX data for {obj.name}")
-                    voxels = [(x, y, z, c) for x, y, z, c in metadata['voxels']]
+                    voxels = np.array(metadata['voxels'], dtype=np.int32).reshape(-1, 4)
                     object_data.append((obj, voxels, True, metadata['palette']))
                     if original_palette is None:
                         original_palette = metadata['palette']
@@ -153,7 +295,7 @@ class VoxExporter:
 
             # No VOX metadata, voxelize the mesh
             all_use_original_indices = False
-            voxels = self._voxelize_object(obj)
+            voxels = self._voxelize_grid(*self._prepare_object(obj))
             object_data.append((obj, voxels, False, None))
 
         if not object_data:
@@ -176,13 +318,12 @@ class VoxExporter:
             color_map = None  # Use original indices
         else:
             # Collect all colors from voxelized objects for palette
-            all_colors = []
-            for obj, voxels, uses_orig, _ in object_data:
-                if not uses_orig:
-                    all_colors.extend([v[3] for v in voxels])
+            color_arrays = [voxels[:, 3:] for _, voxels, uses_orig, _ in object_data
+                            if not uses_orig]
+            all_colors = np.concatenate(color_arrays) if color_arrays else ()
 
-            if all_colors:
-                palette, color_map = quantize_colors(all_colors, 255)
+            if len(all_colors):
+                palette, color_map = self._palette_fn(all_colors, 255)
                 for i, (r, g, b) in enumerate(palette):
                     writer.palette.set_color(i + 1, r, g, b, 255)
                 print(f"Created palette with {len(palette)} colors")
@@ -191,17 +332,14 @@ class VoxExporter:
 
         # Create models and instances for each object
         for obj, voxels, uses_original_indices, obj_palette in object_data:
-            if not voxels:
+            if not len(voxels):
                 print(f"Skipping {obj.name}: no voxels")
                 continue
 
             # Calculate local bounding box for this model
-            min_x = min(v[0] for v in voxels)
-            min_y = min(v[1] for v in voxels)
-            min_z = min(v[2] for v in voxels)
-            max_x = max(v[0] for v in voxels)
-            max_y = max(v[1] for v in voxels)
-            max_z = max(v[2] for v in voxels)
+            coords = voxels[:, :3]
+            min_x, min_y, min_z = coords.min(axis=0).tolist()
+            max_x, max_y, max_z = coords.max(axis=0).tolist()
 
             size_x = max_x - min_x + 1
             size_y = max_y - min_y + 1
@@ -209,33 +347,27 @@ class VoxExporter:
 
             # Create the model with normalized coordinates
             model = vox_writer.VoxModel(size_x, size_y, size_z)
-            seen = set()
-
-            for x, y, z, color_data in voxels:
-                # Normalize to model-local coordinates
-                nx = x - min_x
-                ny = y - min_y
-                nz = z - min_z
 
-                # Clamp coordinates
-                nx = max(0, min(255, nx))
-                ny = max(0, min(255, ny))
-                nz = max(0, min(255, nz))
-
-                key = (nx, ny, nz)
-                if key in seen:
-                    continue
-                seen.add(key)
-
-                # Determine color index
-                if uses_original_indices or all_use_original_indices:
-                    color_idx = color_data if isinstance(color_data, int) else 1
-                    if not (1 <= color_idx <= 255):
-                        color_idx = 1
-                else:
-                    color_idx = color_map.get(color_data, 1) if color_map else 1
+            # Normalize to model-local coordinates and clamp
+            local = np.clip(coords - (min_x, min_y, min_z), 0, 255).astype(np.uint32)
+
+            # Keep the first voxel at each position, in the original order
+            keys = (local[:, 0] << 16) | (local[:, 1] << 8) | local[:, 2]
+            _, first = np.unique(keys, return_index=True)
+            first.sort()
+
+            # Determine color indices
+            if uses_original_indices or all_use_original_indices:
+                color_idx = voxels[first, 3]
+                color_idx = np.where((color_idx >= 1) & (color_idx <= 255), color_idx, 1)
+            elif color_map:
+                keys, inverse = np.unique(pack_rgb(voxels[first, 3:]), return_inverse=True)
+                lut = np.array([color_map.get(c, 1) for c in map(tuple, unpack_rgb(keys).tolist())])
+                color_idx = lut[inverse.reshape(-1)]
+            else:
+                color_idx = np.ones(len(first), dtype=np.int32)
 
-                model.add_voxel(nx, ny, nz, color_idx)
+            model.add_voxels(np.column_stack((local[first], color_idx)))
 
             model_index = writer.add_model(model)
 
@@ -260,16 +392,19 @@ class VoxExporter:
             rotation = 0
 
             writer.add_instance(model_index, (tx, ty, tz), rotation, obj.name)
-            print(f"Added model {obj.name}: {len(seen)} voxels, size {size_x}x{size_y}x{size_z}, pos ({tx}, {ty}, {tz})")
+            print(f"Added model {obj.name}: {len(first)} voxels, size {size_x}x{size_y}x{size_z}, pos ({tx}, {ty}, {tz})")
 
         writer.write(filepath)
         print(f"Exported {len(object_data)} models to {filepath}")
 
-    def _voxelize_object(self, obj: bpy.types.Object) -> List[Tuple[int, int, int, Tuple[int, int, int]]]:
-        """Voxelize a single Blender object.
+    def _prepare_object(self, obj: bpy.types.Object) -> Tuple:
+        """Read everything voxelization needs from a Blender object.
+
+        All RNA access happens here; _voxelize_grid() only works on the
+        BVH tree and arrays returned.
 
         Returns:
-            List of (x, y, z, (r, g, b)) tuples
+            Arguments for _voxelize_grid()
         """
         # Get mesh data
         depsgraph = bpy.context.evaluated_depsgraph_get()
@@ -284,54 +419,49 @@ class VoxExporter:
         # We need to map original polygon -> color
         original_colors = self._extract_colors(mesh, obj)
 
-        # Create BVH tree for ray casting
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
+        # Vertex positions, also used for the bounding box
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        coords = coords.reshape(-1, 3).astype(np.float64)
 
-        # Store original face index before triangulation
-        # Create a custom layer to track which original polygon each triangle came from
-        orig_face_layer = bm.faces.layers.int.new('orig_face')
-        for face in bm.faces:
-            face[orig_face_layer] = face.index
+        # Triangulate; every triangle keeps the index of its original polygon
+        mesh.calc_loop_triangles()
+        tri_count = len(mesh.loop_triangles)
+        tri_verts = np.empty(tri_count * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tri_verts)
+        tri_verts = tri_verts.reshape(-1, 3)
+        tri_to_orig = np.empty(tri_count, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('polygon_index', tri_to_orig)
 
-        # Triangulate - this creates new faces but preserves the layer data
-        bmesh.ops.triangulate(bm, faces=bm.faces)
+        # Create BVH tree for ray casting, face indices are triangle indices
+        bvh = BVHTree.FromPolygons(coords.tolist(), tri_verts.tolist(), all_triangles=True)
+        tri_coords = coords[tri_verts]
 
-        # Build mapping from triangulated face index to original face index
-        bm.faces.ensure_lookup_table()
-        tri_to_orig = {}
-        for i, face in enumerate(bm.faces):
-            tri_to_orig[i] = face[orig_face_layer]
+        # Resolve the color of every triangulated face once up front
+        face_color_lut = self._build_face_color_lut(tri_to_orig, original_colors)
 
-        bvh = BVHTree.FromBMesh(bm)
+        # Calculate bounding box
+        bbox_min = coords.min(axis=0)
+        bbox_max = coords.max(axis=0)
 
-        # Build color_data with triangulated face mapping
-        color_data = {
-            'tri_to_orig': tri_to_orig,
-            'vertex_colors': original_colors['vertex_colors'],
-            'material_colors': original_colors['material_colors'],
-            'face_materials': original_colors['face_materials'],
-            'default_color': original_colors['default_color'],
-        }
+        # Clean up
+        obj_eval.to_mesh_clear()
 
-        # Calculate bounding box
-        bbox_min = Vector((float('inf'), float('inf'), float('inf')))
-        bbox_max = Vector((float('-inf'), float('-inf'), float('-inf')))
-
-        for v in mesh.vertices:
-            co = v.co
-            bbox_min.x = min(bbox_min.x, co.x)
-            bbox_min.y = min(bbox_min.y, co.y)
-            bbox_min.z = min(bbox_min.z, co.z)
-            bbox_max.x = max(bbox_max.x, co.x)
-            bbox_max.y = max(bbox_max.y, co.y)
-            bbox_max.z = max(bbox_max.z, co.z)
+        return bvh, tri_coords, face_color_lut, bbox_min, bbox_max, original_colors['default_color']
+
+    def _voxelize_grid(self, bvh: BVHTree, tri_coords: np.ndarray, face_color_lut: np.ndarray,
+                       bbox_min: np.ndarray, bbox_max: np.ndarray,
+                       default_color: Tuple[int, int, int]) -> np.ndarray:
+        """Voxelize an object prepared by _prepare_object().
 
+        Returns:
+            (N, 6) int32 array of x, y, z, r, g, b rows
+        """
         # Calculate grid dimensions
         size = bbox_max - bbox_min
-        grid_x = int(math.ceil(size.x / self.voxel_size)) + 1
-        grid_y = int(math.ceil(size.y / self.voxel_size)) + 1
-        grid_z = int(math.ceil(size.z / self.voxel_size)) + 1
+        grid_x = int(math.ceil(size[0] / self.voxel_size)) + 1
+        grid_y = int(math.ceil(size[1] / self.voxel_size)) + 1
+        grid_z = int(math.ceil(size[2] / self.voxel_size)) + 1
 
         # Limit to max_size
         scale_factor = 1.0
@@ -344,30 +474,29 @@ class VoxExporter:
 
         adjusted_voxel_size = self.voxel_size / scale_factor
 
-        voxels = []
+        grid_shape = (grid_x, grid_y, grid_z)
+        origin = bbox_min
 
-        # Voxelize using ray casting
-        for gx in range(grid_x):
-            for gy in range(grid_y):
-                for gz in range(grid_z):
-                    # Calculate world position of voxel center
-                    world_pos = Vector((
-                        bbox_min.x + (gx + 0.5) * adjusted_voxel_size,
-                        bbox_min.y + (gy + 0.5) * adjusted_voxel_size,
-                        bbox_min.z + (gz + 0.5) * adjusted_voxel_size,
-                    ))
+        # Only voxels whose hit box (voxel_size around the center) touches a
+        # triangle can get a ray hit, so rasterize the triangles to find them
+        surface = _rasterize_triangles(tri_coords, origin, adjusted_voxel_size, grid_shape)
+        grid_coords = np.argwhere(surface)
+        centers = origin + (grid_coords + 0.5) * adjusted_voxel_size
 
-                    # Check if this voxel should be filled
-                    is_filled, color = self._check_voxel(
-                        bvh, world_pos, adjusted_voxel_size, color_data
-                    )
+        # Voxelize using ray casting, one batch per ray direction
+        hit_faces = self._check_voxels(bvh, centers, adjusted_voxel_size)
 
-                    if is_filled:
-                        voxels.append((gx, gy, gz, color))
+        hit = hit_faces >= 0
+        voxels = np.hstack((grid_coords[hit], face_color_lut[hit_faces[hit]])).astype(np.int32)
 
-        # Clean up
-        bm.free()
-        obj_eval.to_mesh_clear()
+        if self.fill_interior:
+            filled = np.zeros(grid_shape, dtype=bool)
+            filled[tuple(grid_coords[hit].T)] = True
+            interior = np.argwhere(self._interior_cells(bvh, filled, origin, adjusted_voxel_size))
+            interior_voxels = np.empty((len(interior), 6), dtype=np.int32)
+            interior_voxels[:, :3] = interior
+            interior_voxels[:, 3:] = default_color
+            voxels = np.concatenate((voxels, interior_voxels))
 
         return voxels
 
@@ -378,15 +507,15 @@ class VoxExporter:
         """
         color_data = {
             'vertex_colors': None,
-            'material_colors': {},
-            'face_materials': [],
+            'material_colors': [None] * len(obj.material_slots),
+            'face_materials': None,
             'default_color': self.DEFAULT_COLOR,
             'has_any_color': False,
         }
 
-        print(f"[DEBUG] Extracting colors from {obj.name}")
-        print(f"[DEBUG] Material slots: {len(obj.material_slots)}")
-        print(f"[DEBUG] Mesh polygons: {len(mesh.polygons)}")
+        logger.debug("Extracting colors from %s", obj.name)
+        logger.debug("Material slots: %d", len(obj.material_slots))
+        logger.debug("Mesh polygons: %d", len(mesh.polygons))
 
         # Extract vertex colors (check both old and new API)
         if self.use_vertex_colors:
@@ -395,30 +524,20 @@ class VoxExporter:
             # Try new API first (Blender 3.2+)
             if hasattr(mesh, 'color_attributes') and mesh.color_attributes:
                 color_layer = mesh.color_attributes.active_color
-                print(f"[DEBUG] Using color_attributes API, layer: {color_layer.name if color_layer else 'None'}")
+                logger.debug("Using color_attributes API, layer: %s", color_layer.name if color_layer else None)
             # Fall back to old API
             elif hasattr(mesh, 'vertex_colors') and mesh.vertex_colors:
                 color_layer = mesh.vertex_colors.active
-                print(f"[DEBUG] Using vertex_colors API, layer: {color_layer.name if color_layer else 'None'}")
+                logger.debug("Using vertex_colors API, layer: %s", color_layer.name if color_layer else None)
             else:
-                print(f"[DEBUG] No vertex colors found")
+                logger.debug("No vertex colors found")
 
-            if color_layer:
-                color_data['vertex_colors'] = {}
+            if color_layer and len(mesh.polygons):
+                color_data['vertex_colors'] = self._face_vertex_colors(mesh, color_layer)
                 color_data['has_any_color'] = True
-                for poly in mesh.polygons:
-                    face_colors = []
-                    for loop_idx in poly.loop_indices:
-                        col = color_layer.data[loop_idx].color
-                        r = int(col[0] * 255)
-                        g = int(col[1] * 255)
-                        b = int(col[2] * 255)
-                        face_colors.append((r, g, b))
-                    color_data['vertex_colors'][poly.index] = face_colors
-                # Debug: show first face color
-                if color_data['vertex_colors']:
-                    first_colors = list(color_data['vertex_colors'].values())[0]
-                    print(f"[DEBUG] First face vertex colors: {first_colors}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("First face vertex color: %s",
+                                 tuple(color_data['vertex_colors'][0].tolist()))
 
         # Extract material colors
         if self.use_material_colors:
@@ -426,22 +545,53 @@ class VoxExporter:
                 mat = mat_slot.material
                 if mat:
                     # Try to get base color from principled BSDF
-                    color = self._get_material_color(mat)
+                    color = self._material_colors.get(mat.name_full)
+                    if color is None:
+                        color = self._get_material_color(mat)
+                        self._material_colors[mat.name_full] = color
                     color_data['material_colors'][i] = color
                     color_data['has_any_color'] = True
-                    print(f"[DEBUG] Material {i} '{mat.name}': RGB{color}")
+                    logger.debug("Material %d '%s': RGB%s", i, mat.name, color)
                 else:
-                    print(f"[DEBUG] Material slot {i}: no material assigned")
+                    logger.debug("Material slot %d: no material assigned", i)
 
         # Store face material indices
-        for poly in mesh.polygons:
-            color_data['face_materials'].append(poly.material_index)
+        face_materials = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get('material_index', face_materials)
+        color_data['face_materials'] = face_materials
 
-        print(f"[DEBUG] Face material indices: {color_data['face_materials'][:10]}...")  # First 10
-        print(f"[DEBUG] has_any_color: {color_data['has_any_color']}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Face material indices: %s...", face_materials[:10].tolist())  # First 10
+        logger.debug("has_any_color: %s", color_data['has_any_color'])
 
         return color_data
 
+    def _face_vertex_colors(self, mesh: bpy.types.Mesh, color_layer) -> np.ndarray:
+        """Average a color layer per polygon using bulk foreach_get reads.
+
+        Returns:
+            (num_polygons, 3) int array of RGB colors (0-255)
+        """
+        num_polys = len(mesh.polygons)
+        loop_start = np.empty(num_polys, dtype=np.int32)
+        loop_total = np.empty(num_polys, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_start', loop_start)
+        mesh.polygons.foreach_get('loop_total', loop_total)
+
+        cols = np.empty(len(color_layer.data) * 4, dtype=np.float32)
+        color_layer.data.foreach_get('color', cols)
+        # Truncate per vertex like int(col * 255), in double precision
+        cols = (cols.reshape(-1, 4)[:, :3].astype(np.float64) * 255).astype(np.int64)
+
+        # Point-domain color attributes store one color per vertex
+        if getattr(color_layer, 'domain', 'CORNER') == 'POINT':
+            loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+            mesh.loops.foreach_get('vertex_index', loop_verts)
+            cols = cols[loop_verts]
+
+        sums = np.add.reduceat(cols, loop_start, axis=0)
+        return sums // loop_total[:, None]
+
     def _get_material_color(self, material: bpy.types.Material) -> Tuple[int, int, int]:
         """Extract base color from a material."""
         if material.use_nodes:
@@ -461,94 +611,340 @@ class VoxExporter:
         b = int(col[2] * 255)
         return (r, g, b)
 
-    def _check_voxel(self, bvh: BVHTree, pos: Vector, voxel_size: float,
-                     color_data: Dict) -> Tuple[bool, Tuple[int, int, int]]:
-        """Check if a voxel position should be filled and get its color.
+    def _check_voxels(self, bvh: BVHTree, centers: np.ndarray,
+                      voxel_size: float) -> np.ndarray:
+        """Find the surface face hit for each voxel center.
+
+        Casts rays in multiple directions towards every voxel and keeps the
+        closest hit that lies within voxel_size of the voxel center on every
+        axis.
 
-        Uses ray casting to determine if the voxel intersects with the mesh surface.
+        Args:
+            bvh: BVH tree of the triangulated mesh
+            centers: (N, 3) array of voxel center positions
+            voxel_size: Size of a voxel
+
+        Returns:
+            (N,) int array of hit face indices, -1 where no surface was found
         """
-        # Cast rays in multiple directions to detect surface
-        directions = [
-            Vector((1, 0, 0)), Vector((-1, 0, 0)),
-            Vector((0, 1, 0)), Vector((0, -1, 0)),
-            Vector((0, 0, 1)), Vector((0, 0, -1)),
-        ]
-
-        # Add diagonal directions for better coverage
+        # Cast rays in multiple directions to detect surface, adding the
+        # diagonals for better coverage
+        directions = self._AXIS_DIRECTIONS
         if self.ray_samples >= 2:
-            diag = 1.0 / math.sqrt(3)
-            directions.extend([
-                Vector((diag, diag, diag)), Vector((-diag, -diag, -diag)),
-                Vector((diag, -diag, diag)), Vector((-diag, diag, -diag)),
-            ])
+            directions += self._DIAGONAL_DIRECTIONS
 
-        hit_face = None
-        min_dist = float('inf')
+        hit_faces = np.full(len(centers), -1, dtype=np.int64)
+        min_dist = np.full(len(centers), np.inf)
 
         for direction in directions:
             # Cast ray from outside the voxel
-            ray_origin = pos - direction * voxel_size * 2
+            origins = centers - np.asarray(direction) * (voxel_size * 2)
+            hit_pos, face_idx, dist = _cast_rays(bvh, origins, direction)
+            _fold_hits(centers, hit_pos, face_idx, dist, voxel_size,
+                       min_dist, hit_faces)
+
+        return hit_faces
 
-            result = bvh.ray_cast(ray_origin, direction)
-            if result[0] is not None:
-                hit_pos, normal, face_idx, dist = result
+    def _check_interior(self, bvh: BVHTree, centers: np.ndarray) -> np.ndarray:
+        """Check which voxel centers lie inside a closed mesh.
 
-                # Check if hit is within or near the voxel
-                to_hit = hit_pos - pos
-                if abs(to_hit.x) <= voxel_size and abs(to_hit.y) <= voxel_size and abs(to_hit.z) <= voxel_size:
-                    if dist < min_dist:
-                        min_dist = dist
-                        hit_face = face_idx
+        A center counts as inside when rays along all six axis directions
+        hit the mesh.
+
+        Returns:
+            (N,) bool array
+        """
+        inside = np.ones(len(centers), dtype=bool)
+        for direction in self._AXIS_DIRECTIONS:
+            # Only keep casting for centers that are still candidates
+            candidates = np.flatnonzero(inside)
+            if not len(candidates):
+                break
+            _, face_idx, _ = _cast_rays(bvh, centers[candidates], direction)
+            inside[candidates[face_idx < 0]] = False
+        return inside
+
+    def _interior_cells(self, bvh: BVHTree, filled: np.ndarray, origin: np.ndarray,
+                        voxel_size: float) -> np.ndarray:
+        """Find the empty grid cells that lie inside the mesh.
+
+        The grid is split into tiles of _INTERIOR_TILE cells per axis. A
+        tile with no surface near it gives the same six-ray result as the
+        per-cell test with fewer rays: an axis ray from any of its cells
+        crosses the tile without a hit, so it hits the mesh exactly when the
+        ray from the last cell of the same row in the tile does. Those rays
+        are cast once per row and shared along it. Tiles near the surface
+        have each empty cell tested individually.
+
+        Args:
+            bvh: BVH tree of the triangulated mesh
+            filled: Boolean grid of surface voxels
+            origin: World position of the grid corner
+            voxel_size: Size of a voxel
+
+        Returns:
+            Boolean array of the grid's shape
+        """
+        tile = self._INTERIOR_TILE
+        shape = np.asarray(filled.shape)
+        tile_shape = tuple(-(-shape // tile))
+
+        lo = np.indices(tile_shape).reshape(3, -1).T * tile
+        hi = np.minimum(lo + tile, shape)
+
+        # Bounding sphere of a full tile, grown by the voxel hit margin
+        radius = (tile * math.sqrt(3) / 2 + 1) * voxel_size
+        near_faces, _ = _find_nearest(bvh, origin + (lo + hi) / 2 * voxel_size, radius)
+        near = near_faces >= 0
+
+        def expand(tile_mask):
+            cells = tile_mask.reshape(tile_shape)
+            for axis in range(3):
+                cells = cells.repeat(tile, axis=axis)
+            return cells[:shape[0], :shape[1], :shape[2]]
+
+        # Tiles away from the surface: one ray per direction and tile row
+        cells = np.argwhere(expand(~near) & ~filled)
+        inside = np.ones(len(cells), dtype=bool)
+        for direction in self._AXIS_DIRECTIONS:
+            candidates = np.flatnonzero(inside)
+            if not len(candidates):
+                break
+            axis = int(np.flatnonzero(direction)[0])
+            row_end = cells[candidates].copy()
+            if direction[axis] > 0:
+                row_end[:, axis] = np.minimum((row_end[:, axis] // tile + 1) * tile, shape[axis]) - 1
+            else:
+                row_end[:, axis] = row_end[:, axis] // tile * tile
+            row_end, row = np.unique(row_end, axis=0, return_inverse=True)
+            _, face_idx, _ = _cast_rays(bvh, origin + (row_end + 0.5) * voxel_size, direction)
+            inside[candidates[face_idx[row.ravel()] < 0]] = False
 
-        if hit_face is None:
-            # Check for interior fill
-            if self.fill_interior:
-                # Count ray intersections (odd = inside)
-                inside_count = 0
-                for direction in directions[:6]:
-                    result = bvh.ray_cast(pos, direction)
-                    if result[0] is not None:
-                        inside_count += 1
+        interior = np.zeros(filled.shape, dtype=bool)
+        interior[tuple(cells[inside].T)] = True
 
-                if inside_count == 6:  # Rays hit in all directions = inside
-                    return True, color_data['default_color']
+        # Tiles near the surface: every empty cell
+        pending = np.argwhere(expand(near) & ~filled)
+        inside = self._check_interior(bvh, origin + (pending + 0.5) * voxel_size)
+        interior[tuple(pending[inside].T)] = True
 
-            return False, (0, 0, 0)
+        return interior
 
-        # Get color for the hit face
-        color = self._get_face_color(hit_face, color_data)
-        return True, color
+    def _build_face_color_lut(self, tri_to_orig: np.ndarray,
+                              color_data: Dict) -> np.ndarray:
+        """Build a lookup table of colors for the triangulated faces.
 
-    def _get_face_color(self, face_idx: int, color_data: Dict) -> Tuple[int, int, int]:
-        """Get the color for a face.
+        Vertex colors take priority over material colors; faces with
+        neither get the default color.
 
         Args:
-            face_idx: The triangulated face index from BVH ray cast
-            color_data: Color data dict containing tri_to_orig mapping
+            tri_to_orig: Original polygon index of every triangulated face
+            color_data: Color data from _extract_colors()
+
+        Returns:
+            (num_triangulated_faces, 3) uint8 array of RGB colors
         """
-        # Map triangulated face index back to original polygon index
-        orig_face_idx = face_idx
-        if 'tri_to_orig' in color_data and face_idx in color_data['tri_to_orig']:
-            orig_face_idx = color_data['tri_to_orig'][face_idx]
-
-        # Try vertex colors first (using original polygon index)
-        if color_data['vertex_colors'] and orig_face_idx in color_data['vertex_colors']:
-            colors = color_data['vertex_colors'][orig_face_idx]
-            if colors:
-                # Average vertex colors for the face
-                r = sum(c[0] for c in colors) // len(colors)
-                g = sum(c[1] for c in colors) // len(colors)
-                b = sum(c[2] for c in colors) // len(colors)
-                return (r, g, b)
-
-        # Try material color (using original polygon index)
-        if orig_face_idx < len(color_data['face_materials']):
-            mat_idx = color_data['face_materials'][orig_face_idx]
-            if mat_idx in color_data['material_colors']:
-                return color_data['material_colors'][mat_idx]
-
-        # Default color (visible gray, not black)
-        return color_data['default_color']
+        # One row per material slot plus a trailing default row for faces
+        # that point past the last slot
+        material_colors = color_data['material_colors']
+        slot_colors = np.empty((len(material_colors) + 1, 3), dtype=np.int64)
+        slot_colors[:] = color_data['default_color']
+        for slot, color in enumerate(material_colors):
+            if color is not None:
+                slot_colors[slot] = color
+
+        face_materials = color_data['face_materials']
+        slots = np.where((face_materials >= 0) & (face_materials < len(material_colors)),
+                         face_materials, len(material_colors))
+        poly_colors = slot_colors[slots]
+
+        if color_data['vertex_colors'] is not None:
+            poly_colors[:] = color_data['vertex_colors']
+
+        return np.clip(poly_colors[tri_to_orig], 0, 255).astype(np.uint8)
+
+
+def _cast_rays(bvh: BVHTree, origins: np.ndarray,
+               direction: Vector) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Cast one ray per origin along a shared direction.
+
+    Returns:
+        Tuple of (hit positions (N, 3), face indices (N,), distances (N,));
+        rays that miss have NaN positions, face index -1 and infinite distance
+    """
+    n = len(origins)
+    hit_pos = np.full((n, 3), np.nan)
+    face_idx = np.full(n, -1, dtype=np.int64)
+    dist = np.full(n, np.inf)
+
+    ray_cast = bvh.ray_cast
+    for i, origin in enumerate(origins.tolist()):
+        location, _normal, index, distance = ray_cast(origin, direction)
+        if location is not None:
+            hit_pos[i] = location
+            face_idx[i] = index
+            dist[i] = distance
+
+    return hit_pos, face_idx, dist
+
+
+def _find_nearest(bvh: BVHTree, points: np.ndarray,
+                  radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Find the nearest surface within radius of each point.
+
+    Returns:
+        Tuple of (face indices (N,), distances (N,)); points without surface
+        in range have face index -1 and infinite distance
+    """
+    n = len(points)
+    face_idx = np.full(n, -1, dtype=np.int64)
+    dist = np.full(n, np.inf)
+
+    find_nearest = bvh.find_nearest
+    for i, point in enumerate(points.tolist()):
+        location, _normal, index, distance = find_nearest(point, radius)
+        if location is not None:
+            face_idx[i] = index
+            dist[i] = distance
+
+    return face_idx, dist
+
+
+def _fold_hits_numpy(centers, hit_pos, face_idx, dist, voxel_size,
+                     min_dist, hit_faces):
+    """Merge one direction's ray hits into the closest hits so far (in place).
+
+    A hit counts if it lies within voxel_size of the voxel center on every
+    axis; NaN positions (no hit) never do.
+    """
+    near = np.all(np.abs(hit_pos - centers) <= voxel_size, axis=1)
+    closer = near & (dist < min_dist)
+    min_dist[closer] = dist[closer]
+    hit_faces[closer] = face_idx[closer]
+
+
+def _fold_hits_loop(centers, hit_pos, face_idx, dist, voxel_size,
+                    min_dist, hit_faces):
+    """Loop form of _fold_hits_numpy, compiled with Numba when available."""
+    for i in range(centers.shape[0]):
+        if dist[i] >= min_dist[i]:
+            continue
+        if (abs(hit_pos[i, 0] - centers[i, 0]) <= voxel_size
+                and abs(hit_pos[i, 1] - centers[i, 1]) <= voxel_size
+                and abs(hit_pos[i, 2] - centers[i, 2]) <= voxel_size):
+            min_dist[i] = dist[i]
+            hit_faces[i] = face_idx[i]
+
+
+if njit is not None:
+    # Eagerly compiled for the array types _check_voxels passes in
+    _fold_hits = njit(
+        'void(f8[:, :], f8[:, :], i8[:], f8[:], f8, f8[:], i8[:])',
+        cache=True, nogil=True,
+    )(_fold_hits_loop)
+else:
+    _fold_hits = _fold_hits_numpy
+
+
+# Upper bound on (triangle, voxel) pairs tested at once by the rasterizer
+_RASTER_BATCH = 1 << 20
+
+
+def _rasterize_triangles(tris: np.ndarray, origin: np.ndarray, voxel_size: float,
+                         grid_shape: Tuple[int, int, int]) -> np.ndarray:
+    """Mark the voxels whose hit box overlaps any triangle.
+
+    The hit box of a voxel is the cube of half-size voxel_size around its
+    center, matching the ray hit test in VoxExporter._check_voxels. Overlap
+    uses the separating axis test (Akenine-Moller) on every candidate voxel
+    inside each triangle's bounding box.
+
+    Args:
+        tris: (T, 3, 3) array of triangle vertex positions
+        origin: Grid corner (voxel (0, 0, 0) has its minimum corner here)
+        voxel_size: Size of a voxel
+        grid_shape: (grid_x, grid_y, grid_z)
+
+    Returns:
+        Boolean array of shape grid_shape
+    """
+    grid = np.zeros(grid_shape, dtype=bool)
+    if not len(tris):
+        return grid
+
+    # Grid units with voxel centers on integer coordinates
+    tris = (tris - origin) / voxel_size - 0.5
+    half = 1.0 + 1e-6  # Slightly conservative box half-size
+
+    dims = np.asarray(grid_shape) - 1
+    lo = np.clip(np.ceil(tris.min(axis=1) - half), 0, dims).astype(np.int64)
+    hi = np.clip(np.floor(tris.max(axis=1) + half), -1, dims).astype(np.int64)
+    ext = np.maximum(hi - lo + 1, 0)
+    counts = ext.prod(axis=1)
+
+    # Group triangles into batches of roughly _RASTER_BATCH pairs
+    tri_ids = np.flatnonzero(counts)
+    batch_ids = np.cumsum(counts[tri_ids]) // _RASTER_BATCH
+    bounds = np.flatnonzero(np.diff(batch_ids)) + 1
+    for tri_ids in np.split(tri_ids, bounds):
+        if not len(tri_ids):
+            continue
+
+        # Expand every triangle into its candidate voxels
+        batch_counts = counts[tri_ids]
+        pair_tri = np.repeat(tri_ids, batch_counts)
+        starts = np.cumsum(batch_counts) - batch_counts
+        local = np.arange(len(pair_tri)) - np.repeat(starts, batch_counts)
+        pair_ext = ext[pair_tri]
+        cells = lo[pair_tri] + np.stack((
+            local // (pair_ext[:, 1] * pair_ext[:, 2]),
+            (local // pair_ext[:, 2]) % pair_ext[:, 1],
+            local % pair_ext[:, 2],
+        ), axis=1)
+
+        overlap = _tri_box_overlap(tris[pair_tri] - cells[:, None, :], half)
+        cells = cells[overlap]
+        grid[cells[:, 0], cells[:, 1], cells[:, 2]] = True
+
+    return grid
+
+
+def _tri_box_overlap(tris: np.ndarray, half: float) -> np.ndarray:
+    """Separating axis test of triangles against origin-centered cubes.
+
+    Only the triangle normal and the nine edge cross-product axes are
+    tested; the caller already restricts to overlapping bounding boxes.
+
+    Args:
+        tris: (N, 3, 3) array of triangle vertices relative to the cube center
+        half: Cube half-size
+
+    Returns:
+        (N,) bool array, True where triangle and cube overlap
+    """
+    v0, v1, v2 = tris[:, 0], tris[:, 1], tris[:, 2]
+    edges = (v1 - v0, v2 - v1, v0 - v2)
+
+    # Triangle plane against the cube
+    normal = np.cross(edges[0], edges[1])
+    radius = half * np.abs(normal).sum(axis=1)
+    overlap = np.abs((normal * v0).sum(axis=1)) <= radius
+
+    # Cross products of the edges with the cube axes
+    for e in edges:
+        ex, ey, ez = e[:, 0], e[:, 1], e[:, 2]
+        zero = np.zeros_like(ex)
+        for axis in (np.stack((zero, -ez, ey), axis=1),
+                     np.stack((ez, zero, -ex), axis=1),
+                     np.stack((-ey, ex, zero), axis=1)):
+            p0 = (axis * v0).sum(axis=1)
+            p1 = (axis * v1).sum(axis=1)
+            p2 = (axis * v2).sum(axis=1)
+            radius = half * np.abs(axis).sum(axis=1)
+            overlap &= (np.minimum(np.minimum(p0, p1), p2) <= radius)
+            overlap &= (np.maximum(np.maximum(p0, p1), p2) >= -radius)
+
+    return overlap
 
 
 # Utility functions for use outside of Blender
@@ -568,8 +964,6 @@ def voxelize_from_vertices(vertices: List[Tuple[float, float, float]],
     Returns:
         List of (vx, vy, vz, (r, g, b)) voxel data
     """
-    import numpy as np
-
     vertices = np.array(vertices)
     default_color = (180, 180, 180)
 
@@ -581,23 +975,50 @@ def voxelize_from_vertices(vertices: List[Tuple[float, float, float]],
     size = bbox_max - bbox_min
     grid_size = (size / voxel_size).astype(int) + 1
 
-    voxels = []
+    # Simple voxelization: nearest vertex to each grid cell center
+    grid_coords = np.indices(tuple(grid_size)).reshape(3, -1).T
+    grid_points = bbox_min + grid_coords * voxel_size + voxel_size / 2
+    max_dist = voxel_size * 1.5
 
-    # Simple voxelization: check each grid cell
-    for gx in range(grid_size[0]):
-        for gy in range(grid_size[1]):
-            for gz in range(grid_size[2]):
-                world_pos = bbox_min + np.array([gx, gy, gz]) * voxel_size + voxel_size / 2
+    if cKDTree is not None:
+        distances, nearest = cKDTree(vertices).query(grid_points, distance_upper_bound=max_dist)
+    else:
+        distances, nearest = _nearest_vertices(grid_points, vertices)
 
-                # Simple distance-based check to vertices
-                distances = np.linalg.norm(vertices - world_pos, axis=1)
-                min_idx = np.argmin(distances)
+    keep = distances < max_dist
+    voxel_color = [default_color] * int(keep.sum())
+    if colors:
+        voxel_color = [colors[i] if i < len(colors) else default_color
+                       for i in nearest[keep].tolist()]
 
-                if distances[min_idx] < voxel_size * 1.5:
-                    if colors and min_idx < len(colors):
-                        color = colors[min_idx]
-                    else:
-                        color = default_color
-                    voxels.append((gx, gy, gz, color))
+    return [
+        (gx, gy, gz, color)
+        for (gx, gy, gz), color in zip(grid_coords[keep].tolist(), voxel_color)
+    ]
 
-    return voxels
+
+# Point-vertex pairs compared at once by _nearest_vertices, which keeps its
+# (rows, V, 3) float64 temporary around 6 MB
+_NEAREST_VERTEX_PAIRS = 1 << 18
+
+
+def _nearest_vertices(points: np.ndarray, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Brute-force nearest vertex search, used when SciPy is unavailable.
+
+    Args:
+        points: (N, 3) array of query positions
+        vertices: (V, 3) array of vertex positions
+
+    Returns:
+        Tuple of (distances, vertex indices), both of shape (N,)
+    """
+    rows = max(1, _NEAREST_VERTEX_PAIRS // max(1, len(vertices)))
+    distances = np.empty(len(points))
+    indices = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), rows):
+        chunk = points[start:start + rows]
+        dist = ((chunk[:, None, :] - vertices[None, :, :]) ** 2).sum(axis=2)
+        nearest = dist.argmin(axis=1)
+        indices[start:start + rows] = nearest
+        distances[start:start + rows] = np.sqrt(dist[np.arange(len(chunk)), nearest])
+    return distances, indices
@@ -8,20 +8,37 @@ scene graph positioning.
 
 import bpy
 import bmesh
-from typing import List, Tuple, Union
+import mathutils
+from typing import List, Optional, Tuple, Union
+import base64
+import binascii
 import json
 import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
+from . import vox_mesher
 from . import vox_reader
 
 
 # Custom property name for storing VOX metadata
 VOX_METADATA_PROP = "vox_metadata"
 
+# Bit flags for import_vox(flags=...)
+IMPORT_CREATE_MATERIALS = 1 << 0
+IMPORT_VERTEX_COLORS = 1 << 1
+
+# (palette, color table) of the last palette_lut() call, matched by identity
+# since hashing the palette would cost as much as building the table
+_palette_lut_cache = (None, None)
+
 
 def import_vox(filepath: str, scale: float = 0.1,
                create_materials: bool = True,
-               use_vertex_colors: bool = True) -> Union[bpy.types.Object, List[bpy.types.Object]]:
+               use_vertex_colors: bool = True,
+               flags: Optional[int] = None) -> Union[bpy.types.Object, List[bpy.types.Object]]:
     """Import a VOX file into Blender.
 
     For multi-model files, creates separate objects for each model instance
@@ -32,10 +49,16 @@ def import_vox(filepath: str, scale: float = 0.1,
         scale: Scale factor for voxels (default 0.1 = 10cm per voxel)
         create_materials: Create materials for each color
         use_vertex_colors: Apply vertex colors to the mesh
+        flags: Optional IMPORT_* bitfield; overrides create_materials and
+            use_vertex_colors when given
 
     Returns:
         Single object for single-model files, or list of objects for multi-model files
     """
+    if flags is not None:
+        create_materials = bool(flags & IMPORT_CREATE_MATERIALS)
+        use_vertex_colors = bool(flags & IMPORT_VERTEX_COLORS)
+
     # Read the VOX scene with full scene graph support
     scene = vox_reader.read_vox_scene(filepath)
 
@@ -47,6 +70,10 @@ def import_vox(filepath: str, scale: float = 0.1,
         print("Warning: No model instances found in scene")
         return None
 
+    # One material shared by every imported mesh, created only once the
+    # file has parsed and has something to import
+    material = get_flat_material() if create_materials else None
+
     # Create a parent empty for the scene
     base_name = os.path.splitext(os.path.basename(filepath))[0]
 
@@ -57,7 +84,7 @@ def import_vox(filepath: str, scale: float = 0.1,
 
         obj = create_model_object(
             model, scene.palette, scale, use_vertex_colors,
-            name if name else base_name
+            name if name else base_name, material
         )
 
         # Apply translation (convert from voxel units to world units)
@@ -78,9 +105,6 @@ def import_vox(filepath: str, scale: float = 0.1,
 
         store_vox_metadata_for_model(obj, model, scene.palette, filepath)
 
-        if create_materials:
-            create_flat_material(obj)
-
         obj.data.update()
         return obj
 
@@ -89,7 +113,26 @@ def import_vox(filepath: str, scale: float = 0.1,
     parent.empty_display_type = 'PLAIN_AXES'
     bpy.context.collection.objects.link(parent)
 
+    # Mesh buffers are plain NumPy, so with the compiled mesher, which
+    # releases the GIL, distinct models are built in parallel. The pure
+    # Python fallback would only serialize on the GIL, so it runs in turn.
+    # Only the datablocks are created on the main thread
+    model_ids = list(dict.fromkeys(
+        model_id for model_id, _, _, _ in scene.instances if model_id < len(scene.models)
+    ))
+    jobs = [scene.models[model_id] for model_id in model_ids]
+    if len(jobs) > 1 and vox_mesher.COMPILED:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            results = list(pool.map(
+                lambda model: build_mesh_arrays(model, scene.palette, scale), jobs
+            ))
+    else:
+        results = [build_mesh_arrays(model, scene.palette, scale) for model in jobs]
+    model_arrays = dict(zip(model_ids, results))
+
     created_objects = []
+    model_meshes = {}  # model_id -> mesh shared by all instances of the model
+    model_metadata = {}  # model_id -> encoded metadata shared the same way
 
     for idx, (model_id, translation, rotation, name) in enumerate(scene.instances):
         if model_id >= len(scene.models):
@@ -99,9 +142,13 @@ def import_vox(filepath: str, scale: float = 0.1,
         model = scene.models[model_id]
         obj_name = name if name else f"{base_name}_{idx}"
 
-        obj = create_model_object(
-            model, scene.palette, scale, use_vertex_colors, obj_name
-        )
+        mesh = model_meshes.get(model_id)
+        if mesh is None:
+            mesh = mesh_from_arrays(
+                model_arrays.pop(model_id), f"{obj_name}_mesh", use_vertex_colors, material
+            )
+            model_meshes[model_id] = mesh
+        obj = bpy.data.objects.new(obj_name, mesh)
 
         # Apply translation
         tx, ty, tz = translation
@@ -120,14 +167,22 @@ def import_vox(filepath: str, scale: float = 0.1,
         # Parent to the scene empty
         obj.parent = parent
 
-        store_vox_metadata_for_model(obj, model, scene.palette, filepath)
-
-        if create_materials:
-            create_flat_material(obj)
+        metadata = model_metadata.get(model_id)
+        if metadata is None:
+            metadata = _model_metadata(model, scene.palette, filepath)
+            model_metadata[model_id] = metadata
+        obj[VOX_METADATA_PROP] = metadata
 
-        obj.data.update()
         created_objects.append(obj)
 
+    # Link everything once it is set up, so the depsgraph is not tagged
+    # for every property change above
+    objects = bpy.context.collection.objects
+    for obj in created_objects:
+        objects.link(obj)
+    for mesh in model_meshes.values():
+        mesh.update()
+
     # Select the parent
     bpy.context.view_layer.objects.active = parent
     parent.select_set(True)
@@ -154,9 +209,15 @@ def apply_vox_rotation(obj: bpy.types.Object, rotation_index: int):
     if rotation_index == 0:
         return  # No rotation
 
-    import mathutils
-    import math
+    # Apply rotation
+    euler = _ROTATION_EULERS.get(rotation_index & 0x7F)
+    if euler is None:
+        euler = _rotation_matrix(rotation_index).to_euler()
+    obj.rotation_euler = euler
+
 
+def _rotation_matrix(rotation_index: int) -> mathutils.Matrix:
+    """Decode a MagicaVoxel rotation byte into a 3x3 matrix."""
     # Decode rotation index
     idx1 = rotation_index & 0x3
     idx2 = (rotation_index >> 2) & 0x3
@@ -175,21 +236,23 @@ def apply_vox_rotation(obj: bpy.types.Object, rotation_index: int):
     mat[2][idx3] = sign3
 
     # Convert to Blender matrix
-    rot_matrix = mathutils.Matrix([
-        [mat[0][0], mat[0][1], mat[0][2]],
-        [mat[1][0], mat[1][1], mat[1][2]],
-        [mat[2][0], mat[2][1], mat[2][2]]
-    ])
+    return mathutils.Matrix(mat)
 
-    # Apply rotation
-    obj.rotation_euler = rot_matrix.to_euler()
+
+# Euler rotation for every well-formed rotation byte, there are only 48
+_ROTATION_EULERS = {
+    idx1 | (idx2 << 2) | (signs << 4): _rotation_matrix(idx1 | (idx2 << 2) | (signs << 4)).to_euler()
+    for idx1 in range(3) for idx2 in range(3) if idx1 != idx2
+    for signs in range(8)
+}
 
 
 def create_model_object(model: vox_reader.VoxModel,
                         palette: List[Tuple[int, int, int, int]],
                         scale: float,
                         use_vertex_colors: bool,
-                        name: str) -> bpy.types.Object:
+                        name: str,
+                        material: Optional[bpy.types.Material] = None) -> bpy.types.Object:
     """Create a Blender object from a VoxModel.
 
     Args:
@@ -198,32 +261,109 @@ def create_model_object(model: vox_reader.VoxModel,
         scale: Scale factor
         use_vertex_colors: Whether to apply vertex colors
         name: Object name
+        material: Optional material to assign to the mesh
 
     Returns:
         The created Blender object
     """
-    mesh = bpy.data.meshes.new(f"{name}_mesh")
+    mesh = create_model_mesh(model, palette, scale, use_vertex_colors, f"{name}_mesh", material)
     obj = bpy.data.objects.new(name, mesh)
 
     bpy.context.collection.objects.link(obj)
 
-    # Build voxel cubes
-    voxel_face_colors = []
-    bm = bmesh.new()
-    face_idx = 0
+    return obj
+
+
+def create_model_mesh(model: vox_reader.VoxModel,
+                      palette: List[Tuple[int, int, int, int]],
+                      scale: float,
+                      use_vertex_colors: bool,
+                      name: str,
+                      material: Optional[bpy.types.Material] = None) -> bpy.types.Mesh:
+    """Create the mesh datablock for a VoxModel.
+
+    The mesh can be shared by every object instancing the model.
+
+    Args:
+        model: The VoxModel to create
+        palette: Color palette
+        scale: Scale factor
+        use_vertex_colors: Whether to apply vertex colors
+        name: Mesh name
+        material: Optional material to assign to the mesh
+
+    Returns:
+        The created Blender mesh
+    """
+    arrays = build_mesh_arrays(model, palette, scale)
+    return mesh_from_arrays(arrays, name, use_vertex_colors, material)
+
+
+def build_mesh_arrays(model: vox_reader.VoxModel,
+                      palette: List[Tuple[int, int, int, int]],
+                      scale: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build the mesh buffers for a VoxModel without touching bpy.
+
+    Safe to call from worker threads.
+
+    Args:
+        model: The VoxModel to mesh
+        palette: Color palette
+        scale: Scale factor
+
+    Returns:
+        Tuple of ((V, 3) float32 vertex positions, (4 * Q,) int32 loop
+        vertex indices, (4 * Q, 4) float32 loop colors)
+    """
+    # Build merged surface quads with shared corner vertices
+    grid = vox_mesher.voxel_grid(model.voxels, (model.size_x, model.size_y, model.size_z))
+    verts, loop_verts, quad_colors = vox_mesher.build_mesh(grid, scale)
+
+    # Every loop takes the palette color of its quad
+    loop_colors = np.repeat(palette_lut(palette)[quad_colors], 4, axis=0)
+    return verts, loop_verts, loop_colors
+
+
+def mesh_from_arrays(arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                     name: str,
+                     use_vertex_colors: bool,
+                     material: Optional[bpy.types.Material] = None) -> bpy.types.Mesh:
+    """Create a mesh datablock from build_mesh_arrays() buffers.
 
-    for x, y, z, color_idx in model.voxels:
-        faces_created = create_voxel_cube_fast(bm, x, y, z, scale)
-        voxel_face_colors.append((face_idx, faces_created, color_idx))
-        face_idx += faces_created
+    Args:
+        arrays: Buffers returned by build_mesh_arrays()
+        name: Mesh name
+        use_vertex_colors: Whether to apply vertex colors
+        material: Optional material to assign to the mesh
 
-    bm.to_mesh(mesh)
-    bm.free()
+    Returns:
+        The created Blender mesh
+    """
+    verts, loop_verts, loop_colors = arrays
+    num_quads = len(loop_verts) // 4
+    mesh = bpy.data.meshes.new(name)
+
+    # Fill the mesh from flat buffers, four loops per quad
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set('co', verts.ravel())
+    mesh.loops.add(num_quads * 4)
+    mesh.loops.foreach_set('vertex_index', loop_verts)
+    mesh.polygons.add(num_quads)
+    mesh.polygons.foreach_set('loop_start', np.arange(0, num_quads * 4, 4, dtype=np.int32))
+    if bpy.app.version < (3, 6, 0):
+        # From 3.6 polygons are stored as offsets, so the totals follow from
+        # loop_start and are read-only
+        mesh.polygons.foreach_set('loop_total', np.full(num_quads, 4, dtype=np.int32))
+    mesh.update(calc_edges=True)
 
     if use_vertex_colors:
-        add_vertex_colors_for_model(mesh, palette, voxel_face_colors)
+        _color_layer(mesh).data.foreach_set('color', loop_colors.ravel())
 
-    return obj
+    if material is not None:
+        # The mesh is new, so there are no existing slots to check
+        mesh.materials.append(material)
+
+    return mesh
 
 
 def add_vertex_colors_for_model(mesh: bpy.types.Mesh,
@@ -236,29 +376,64 @@ def add_vertex_colors_for_model(mesh: bpy.types.Mesh,
         palette: Color palette (list of RGBA tuples)
         voxel_face_colors: List of (face_start_idx, face_count, color_idx) per voxel
     """
+    color_layer = _color_layer(mesh)
+
+    num_polys = len(mesh.polygons)
+    face_colors = np.empty((num_polys, 4), dtype=np.float32)
+    face_colors[:] = (0.7, 0.7, 0.7, 1.0)
+
+    if voxel_face_colors:
+        face_start, face_count, color_idx = np.array(voxel_face_colors, dtype=np.int64).T
+
+        # Palette colors, white for indices outside the palette
+        lut = palette_lut(palette)
+        colors = lut[np.where((color_idx >= 0) & (color_idx < len(lut)), color_idx, 0)]
+
+        # Expand every entry to the faces it covers
+        faces = (np.repeat(face_start - np.cumsum(face_count) + face_count, face_count)
+                 + np.arange(face_count.sum()))
+        in_mesh = faces < num_polys
+        face_colors[faces[in_mesh]] = np.repeat(colors, face_count, axis=0)[in_mesh]
+
+    # Every loop takes the color of its polygon
+    loop_start = np.empty(num_polys, dtype=np.int32)
+    loop_total = np.empty(num_polys, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_start)
+    mesh.polygons.foreach_get('loop_total', loop_total)
+    loop_colors = np.empty((len(mesh.loops), 4), dtype=np.float32)
+    loop_colors[:] = (0.7, 0.7, 0.7, 1.0)
+    loops = (np.repeat(loop_start - np.cumsum(loop_total) + loop_total, loop_total)
+             + np.arange(loop_total.sum()))
+    loop_colors[loops] = np.repeat(face_colors, loop_total, axis=0)
+    color_layer.data.foreach_set('color', loop_colors.ravel())
+
+
+def _color_layer(mesh: bpy.types.Mesh):
+    """Get the mesh's active color layer, creating "VoxelColors" if it has none."""
     if hasattr(mesh, 'color_attributes'):
         if not mesh.color_attributes:
             mesh.color_attributes.new(name="VoxelColors", type='BYTE_COLOR', domain='CORNER')
-        color_layer = mesh.color_attributes.active_color
-    else:
-        if not mesh.vertex_colors:
-            mesh.vertex_colors.new(name="VoxelColors")
-        color_layer = mesh.vertex_colors.active
-
-    face_to_color = {}
-    for face_start, face_count, color_idx in voxel_face_colors:
-        if 1 <= color_idx <= 255 and (color_idx - 1) < len(palette):
-            r, g, b, a = palette[color_idx - 1]
-            color = (r / 255.0, g / 255.0, b / 255.0, a / 255.0)
-        else:
-            color = (1.0, 1.0, 1.0, 1.0)
-        for fi in range(face_start, face_start + face_count):
-            face_to_color[fi] = color
-
-    for poly_idx, poly in enumerate(mesh.polygons):
-        color = face_to_color.get(poly_idx, (0.7, 0.7, 0.7, 1.0))
-        for loop_idx in poly.loop_indices:
-            color_layer.data[loop_idx].color = color
+        return mesh.color_attributes.active_color
+    if not mesh.vertex_colors:
+        mesh.vertex_colors.new(name="VoxelColors")
+    return mesh.vertex_colors.active
+
+
+def palette_lut(palette: List[Tuple[int, int, int, int]]) -> np.ndarray:
+    """Get a (256, 4) float32 color table indexed directly by color index.
+
+    Row 0 and rows past the end of the palette are white. The table of the
+    last palette object passed in is reused, so every model of an import
+    shares one; palettes must not be modified after their first lookup.
+    """
+    global _palette_lut_cache
+    cached_palette, lut = _palette_lut_cache
+    if cached_palette is not palette:
+        lut = np.ones((256, 4), dtype=np.float32)
+        colors = np.asarray(palette[:255], dtype=np.float32).reshape(-1, 4)
+        lut[1:len(colors) + 1] = colors * (1.0 / 255.0)
+        _palette_lut_cache = (palette, lut)
+    return lut
 
 
 def store_vox_metadata_for_model(obj: bpy.types.Object,
@@ -266,13 +441,34 @@ def store_vox_metadata_for_model(obj: bpy.types.Object,
                                   palette: List[Tuple[int, int, int, int]],
                                   filepath: str):
     """Store VOX metadata on an object for a specific model."""
-    metadata = {
-        "source_file": filepath,
-        "size": [model.size_x, model.size_y, model.size_z],
-        "voxels": [[x, y, z, c] for x, y, z, c in model.voxels],
-        "palette": [[r, g, b, a] for r, g, b, a in palette],
-    }
-    obj[VOX_METADATA_PROP] = json.dumps(metadata)
+    obj[VOX_METADATA_PROP] = _model_metadata(model, palette, filepath)
+
+
+def _model_metadata(model: vox_reader.VoxModel,
+                    palette: List[Tuple[int, int, int, int]],
+                    filepath: str) -> str:
+    """Encode the VOX metadata of a specific model."""
+    return _encode_metadata(
+        filepath, (model.size_x, model.size_y, model.size_z), model.voxels, palette
+    )
+
+
+def _encode_metadata(filepath: str, size: Tuple[int, int, int], voxels, palette) -> str:
+    """Serialize VOX metadata to the JSON string stored on objects.
+
+    Voxels and palette are stored as zlib compressed, base64 encoded uint8
+    bytes with their shape, which is far smaller than nested JSON lists.
+    """
+    metadata = {"source_file": filepath, "size": list(size)}
+    for key, rows in (("voxels", voxels), ("palette", palette)):
+        arr = np.asarray(rows, dtype=np.uint8).reshape(-1, 4)
+        # Level 1 already shrinks voxel rows well and keeps imports fast
+        packed = zlib.compress(arr.tobytes(), 1)
+        metadata[key] = base64.b64encode(packed).decode('ascii')
+        metadata[f"{key}_codec"] = "zlib"
+        metadata[f"{key}_dtype"] = "u1"
+        metadata[f"{key}_shape"] = list(arr.shape)
+    return json.dumps(metadata)
 
 
 def create_voxel_cube_fast(bm: bmesh.types.BMesh, x: int, y: int, z: int,
@@ -321,31 +517,8 @@ def add_vertex_colors_per_face(mesh: bpy.types.Mesh, vox_data: vox_reader.VoxelD
         vox_data: VOX data with palette
         voxel_face_colors: List of (face_start_idx, face_count, color_idx) per voxel
     """
-    # Create vertex color layer using the appropriate API
-    if hasattr(mesh, 'color_attributes'):
-        # Blender 3.2+ API
-        if not mesh.color_attributes:
-            mesh.color_attributes.new(name="VoxelColors", type='BYTE_COLOR', domain='CORNER')
-        color_layer = mesh.color_attributes.active_color
-    else:
-        # Old API
-        if not mesh.vertex_colors:
-            mesh.vertex_colors.new(name="VoxelColors")
-        color_layer = mesh.vertex_colors.active
-
-    # Build face index to color mapping
-    face_to_color = {}
-    for face_start, face_count, color_idx in voxel_face_colors:
-        r, g, b, a = vox_reader.get_voxel_color(vox_data, color_idx)
-        color = (r / 255.0, g / 255.0, b / 255.0, a / 255.0)
-        for fi in range(face_start, face_start + face_count):
-            face_to_color[fi] = color
-
-    # Apply colors to all loops of each face
-    for poly_idx, poly in enumerate(mesh.polygons):
-        color = face_to_color.get(poly_idx, (0.7, 0.7, 0.7, 1.0))
-        for loop_idx in poly.loop_indices:
-            color_layer.data[loop_idx].color = color
+    # Same palette lookup as get_voxel_color, written with one foreach_set
+    add_vertex_colors_for_model(mesh, vox_data.palette, voxel_face_colors)
 
 
 def store_vox_metadata(obj: bpy.types.Object, vox_data: vox_reader.VoxelData,
@@ -354,39 +527,61 @@ def store_vox_metadata(obj: bpy.types.Object, vox_data: vox_reader.VoxelData,
 
     This allows the exporter to preserve exact voxel positions and colors.
     """
-    metadata = {
-        "source_file": filepath,
-        "size": [vox_data.size_x, vox_data.size_y, vox_data.size_z],
-        "voxels": [[x, y, z, c] for x, y, z, c in vox_data.voxels],
-        "palette": [[r, g, b, a] for r, g, b, a in vox_data.palette],
-    }
-
     # Store as JSON string in custom property
-    obj[VOX_METADATA_PROP] = json.dumps(metadata)
+    obj[VOX_METADATA_PROP] = _encode_metadata(
+        filepath, (vox_data.size_x, vox_data.size_y, vox_data.size_z),
+        vox_data.voxels, vox_data.palette
+    )
 
 
 def get_vox_metadata(obj: bpy.types.Object) -> dict:
     """Retrieve VOX metadata from an object if available.
 
+    Metadata written by older versions stores voxels and palette as JSON
+    lists and is returned unchanged. Binary metadata, compressed or not, is
+    decoded to an (N, 4) uint8 voxel array and a list of RGBA palette tuples.
+
     Returns:
         Dict with VOX metadata, or empty dict if not available
     """
     if VOX_METADATA_PROP in obj:
         try:
-            return json.loads(obj[VOX_METADATA_PROP])
-        except (json.JSONDecodeError, TypeError):
+            metadata = json.loads(obj[VOX_METADATA_PROP])
+            for key in ("voxels", "palette"):
+                if f"{key}_dtype" in metadata:
+                    raw = base64.b64decode(metadata[key])
+                    if metadata.get(f"{key}_codec") == "zlib":
+                        raw = zlib.decompress(raw)
+                    metadata[key] = np.frombuffer(raw, dtype=np.dtype(metadata[f"{key}_dtype"])
+                                                  ).reshape(metadata[f"{key}_shape"])
+            if "palette_dtype" in metadata:
+                metadata["palette"] = list(map(tuple, metadata["palette"].tolist()))
+            return metadata
+        except (json.JSONDecodeError, TypeError, ValueError, binascii.Error, zlib.error):
             pass
     return {}
 
 
 def create_flat_material(obj: bpy.types.Object):
-    """Create a flat/unlit material using vertex colors (like MagicaVoxel).
-
-    Uses an Emission shader to display colors without shading.
+    """Assign the flat vertex color material to an object.
 
     Args:
         obj: The Blender object
     """
+    mat = get_flat_material()
+    if mat.name not in [slot.name for slot in obj.material_slots if slot.material]:
+        obj.data.materials.append(mat)
+
+
+def get_flat_material() -> bpy.types.Material:
+    """Get the flat/unlit material using vertex colors (like MagicaVoxel).
+
+    Uses an Emission shader to display colors without shading. The
+    material is created on first use and reused afterwards.
+
+    Returns:
+        The "VOX_Flat" material
+    """
     # Create a material that uses vertex colors with emission (flat/unlit)
     mat_name = "VOX_Flat"
     mat = bpy.data.materials.get(mat_name)
@@ -418,6 +613,4 @@ def create_flat_material(obj: bpy.types.Object):
         links.new(vertex_color.outputs['Color'], emission.inputs['Color'])
         links.new(emission.outputs['Emission'], output.inputs['Surface'])
 
-    # Assign material to object
-    if mat.name not in [slot.name for slot in obj.material_slots if slot.material]:
-        obj.data.materials.append(mat)
+    return mat
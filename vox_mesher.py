@@ -0,0 +1,257 @@
+"""
+Voxel Meshing for the VOX Importer
+
+Turns voxel models into a compact surface mesh:
+1. Faces between two filled voxels are culled
+2. Visible faces are greedy-merged into same-color rectangles per slice
+3. Quads meeting at a grid corner share one vertex
+
+Uses only NumPy, so it can run outside Blender and off the main thread.
+The merge loops are compiled with Numba when it is installed.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, Blender does not bundle it
+    njit = None
+
+# Whether the merge loops are compiled; only then do they release the GIL
+# and gain anything from running on several threads
+COMPILED = njit is not None
+
+
+def voxel_grid(voxels, size: Tuple[int, int, int]) -> np.ndarray:
+    """Build a dense grid of color indices from voxel rows.
+
+    The grid has one empty cell of padding on every side, so voxel
+    (x, y, z) is at grid[x + 1, y + 1, z + 1]. Color index 0 is empty.
+
+    Args:
+        voxels: (N, 4) array-like of (x, y, z, color_index) rows
+        size: Model size (size_x, size_y, size_z). It comes straight from
+            the file, so each axis is clamped to 256, past which no voxel
+            coordinate can reach.
+
+    Returns:
+        uint8 array of shape max(clamped size, voxel extent) + 2
+    """
+    voxels = np.asarray(voxels, dtype=np.int64).reshape(-1, 4)
+    dims = np.clip(np.asarray(size, dtype=np.int64), 0, 256)
+    if len(voxels):
+        dims = np.maximum(dims, voxels[:, :3].max(axis=0) + 1)
+
+    grid = np.zeros(dims + 2, dtype=np.uint8)
+    grid[voxels[:, 0] + 1, voxels[:, 1] + 1, voxels[:, 2] + 1] = voxels[:, 3]
+    return grid
+
+
+def build_mesh(grid: np.ndarray, scale: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build mesh buffers for the visible surface of a voxel grid.
+
+    Args:
+        grid: Padded color grid from voxel_grid()
+        scale: Size of a voxel in world units
+
+    Returns:
+        Tuple of ((V, 3) float32 vertex positions, (4 * Q,) int32 loop
+        vertex indices, (Q,) uint8 color index per quad); quads wind
+        counter-clockwise seen from outside
+    """
+    quads, colors = greedy_quads(grid)
+
+    # Corners are at most 256, so each packs into 9 bits per axis
+    corners = quads.reshape(-1, 3)
+    keys = (corners[:, 0] << 18) | (corners[:, 1] << 9) | corners[:, 2]
+    keys, loop_verts = np.unique(keys, return_inverse=True)
+    verts = np.stack(((keys >> 18) & 0x1FF, (keys >> 9) & 0x1FF, keys & 0x1FF), axis=1)
+
+    return ((verts * scale).astype(np.float32),
+            loop_verts.reshape(-1).astype(np.int32),
+            colors)
+
+
+def greedy_quads(grid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build the visible surface of a voxel grid as merged quads.
+
+    Args:
+        grid: Padded color grid from voxel_grid()
+
+    Returns:
+        Tuple of ((Q, 4, 3) int32 array of quad corners in voxel units,
+        (Q,) uint8 array of color indices)
+    """
+    solid = grid != 0
+
+    # Every visible face ends up in at most one quad. A face is visible
+    # wherever neighbors along an axis differ in occupancy, and the padding
+    # means no face sits on the grid edge
+    max_quads = 0
+    for axis in range(3):
+        cells = np.moveaxis(solid, axis, 0)
+        max_quads += int(np.count_nonzero(cells[1:] != cells[:-1]))
+
+    return _greedy_quads(grid, max_quads)
+
+
+def _greedy_quads_numpy(grid: np.ndarray, max_quads: int) -> Tuple[np.ndarray, np.ndarray]:
+    """NumPy version of the greedy mesher, used when Numba is unavailable."""
+    quads = []
+    quad_colors = []
+    for axis in range(3):
+        u_axis, v_axis = (axis + 1) % 3, (axis + 2) % 3
+        # Put the slice axis first, then the two in-plane axes
+        cells = np.transpose(grid, (axis, u_axis, v_axis))
+        solid = cells != 0
+
+        for step in (1, -1):
+            # Faces whose neighbor in the step direction is empty. The grid
+            # is padded with empty layers, so the edge layer can stay False.
+            exposed = np.zeros_like(solid)
+            if step > 0:
+                exposed[:-1] = solid[:-1] & ~solid[1:]
+            else:
+                exposed[1:] = solid[1:] & ~solid[:-1]
+            visible = np.where(exposed, cells, 0)
+
+            for layer in np.flatnonzero(visible.any(axis=(1, 2))):
+                # Plane of the face in padded coordinates, then unpadded
+                plane_pos = layer - 1 + (1 if step > 0 else 0)
+                for u0, v0, u1, v1, color in _greedy_rects(visible[layer]):
+                    rect = [(u0, v0), (u1, v0), (u1, v1), (u0, v1)]
+                    if step < 0:
+                        rect.reverse()
+                    corners = []
+                    for u, v in rect:
+                        corner = [0, 0, 0]
+                        corner[axis] = plane_pos
+                        corner[u_axis] = u - 1
+                        corner[v_axis] = v - 1
+                        corners.append(corner)
+                    quads.append(corners)
+                    quad_colors.append(color)
+
+    return (np.array(quads, dtype=np.int32).reshape(-1, 4, 3),
+            np.array(quad_colors, dtype=np.uint8))
+
+
+def _greedy_rects(plane: np.ndarray) -> List[Tuple[int, int, int, int, int]]:
+    """Cover the non-zero cells of a 2D color array with same-color rectangles.
+
+    Returns:
+        List of (u0, v0, u1, v1, color) with exclusive upper bounds
+    """
+    remaining = plane.copy()
+    num_u, num_v = plane.shape
+    rects = []
+
+    for u, v in np.argwhere(plane).tolist():
+        color = remaining[u, v]
+        if not color:
+            continue  # Already covered by an earlier rectangle
+
+        # Grow along v while the color matches
+        v1 = v + 1
+        while v1 < num_v and remaining[u, v1] == color:
+            v1 += 1
+
+        # Grow along u while the whole run matches
+        u1 = u + 1
+        while u1 < num_u and (remaining[u1, v:v1] == color).all():
+            u1 += 1
+
+        remaining[u:u1, v:v1] = 0
+        rects.append((u, v, u1, v1, int(color)))
+
+    return rects
+
+
+def _cell_loop(grid, axis, layer, u, v):
+    """Grid value at a (layer, u, v) slice position along an axis."""
+    if axis == 0:
+        return grid[layer, u, v]
+    if axis == 1:
+        return grid[v, layer, u]
+    return grid[u, v, layer]
+
+
+def _greedy_quads_loop(grid, max_quads):
+    """Greedy mesher written as plain loops for Numba.
+
+    Emits the same quads in the same order as _greedy_quads_numpy.
+    """
+    quads = np.empty((max_quads, 4, 3), dtype=np.int32)
+    colors = np.empty(max_quads, dtype=np.uint8)
+    count = 0
+
+    for axis in range(3):
+        u_axis = (axis + 1) % 3
+        v_axis = (axis + 2) % 3
+        num_u = grid.shape[u_axis]
+        num_v = grid.shape[v_axis]
+        plane = np.zeros((num_u, num_v), dtype=np.uint8)
+
+        for step in (1, -1):
+            for layer in range(1, grid.shape[axis] - 1):
+                # Faces whose neighbor in the step direction is empty
+                any_visible = False
+                for u in range(num_u):
+                    for v in range(num_v):
+                        color = _cell(grid, axis, layer, u, v)
+                        if color != 0 and _cell(grid, axis, layer + step, u, v) == 0:
+                            plane[u, v] = color
+                            any_visible = True
+                        else:
+                            plane[u, v] = 0
+                if not any_visible:
+                    continue
+
+                plane_pos = layer - 1
+                if step > 0:
+                    plane_pos += 1
+
+                for u in range(num_u):
+                    for v in range(num_v):
+                        color = plane[u, v]
+                        if color == 0:
+                            continue
+
+                        # Grow along v while the color matches
+                        v1 = v + 1
+                        while v1 < num_v and plane[u, v1] == color:
+                            v1 += 1
+
+                        # Grow along u while the whole run matches
+                        u1 = u + 1
+                        while u1 < num_u:
+                            match = True
+                            for k in range(v, v1):
+                                if plane[u1, k] != color:
+                                    match = False
+                                    break
+                            if not match:
+                                break
+                            u1 += 1
+
+                        plane[u:u1, v:v1] = 0
+
+                        for c in range(4):
+                            corner = c if step > 0 else 3 - c
+                            quads[count, c, axis] = plane_pos
+                            quads[count, c, u_axis] = (u if corner == 0 or corner == 3 else u1) - 1
+                            quads[count, c, v_axis] = (v if corner <= 1 else v1) - 1
+                        colors[count] = color
+                        count += 1
+
+    return quads[:count].copy(), colors[:count].copy()
+
+
+if njit is not None:
+    _cell = njit(cache=True, nogil=True)(_cell_loop)
+    _greedy_quads = njit(cache=True, nogil=True)(_greedy_quads_loop)
+else:
+    _cell = _cell_loop
+    _greedy_quads = _greedy_quads_numpy
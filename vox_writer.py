@@ -12,10 +12,66 @@ File Structure (RIFF style):
   - RGBA chunk (palette)
 """
 
+import os
 import struct
+from itertools import chain
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional, Blender does not bundle it
+    njit = None
+    prange = range
+
+
+# Precompiled little-endian layouts used by the writer
+_U32 = struct.Struct('<I')
+_U32X2 = struct.Struct('<II')
+_U32X3 = struct.Struct('<III')
+_U32X4 = struct.Struct('<IIII')
+_RGBA = struct.Struct('<BBBB')
+# File header (magic, version) plus the MAIN chunk header
+_HEADER = struct.Struct('<4sI4sII')
+
+# Default palette from MagicaVoxel specification, one AABBGGRR value per entry
+_DEFAULT_PALETTE_HEX = (
+    0x00000000, 0xffffffff, 0xffccffff, 0xff99ffff, 0xff66ffff, 0xff33ffff, 0xff00ffff, 0xffffccff,
+    0xffccccff, 0xff99ccff, 0xff66ccff, 0xff33ccff, 0xff00ccff, 0xffff99ff, 0xffcc99ff, 0xff9999ff,
+    0xff6699ff, 0xff3399ff, 0xff0099ff, 0xffff66ff, 0xffcc66ff, 0xff9966ff, 0xff6666ff, 0xff3366ff,
+    0xff0066ff, 0xffff33ff, 0xffcc33ff, 0xff9933ff, 0xff6633ff, 0xff3333ff, 0xff0033ff, 0xffff00ff,
+    0xffcc00ff, 0xff9900ff, 0xff6600ff, 0xff3300ff, 0xff0000ff, 0xffffffcc, 0xffccffcc, 0xff99ffcc,
+    0xff66ffcc, 0xff33ffcc, 0xff00ffcc, 0xffffcccc, 0xffcccccc, 0xff99cccc, 0xff66cccc, 0xff33cccc,
+    0xff00cccc, 0xffff99cc, 0xffcc99cc, 0xff9999cc, 0xff6699cc, 0xff3399cc, 0xff0099cc, 0xffff66cc,
+    0xffcc66cc, 0xff9966cc, 0xff6666cc, 0xff3366cc, 0xff0066cc, 0xffff33cc, 0xffcc33cc, 0xff9933cc,
+    0xff6633cc, 0xff3333cc, 0xff0033cc, 0xffff00cc, 0xffcc00cc, 0xff9900cc, 0xff6600cc, 0xff3300cc,
+    0xff0000cc, 0xffffff99, 0xffccff99, 0xff99ff99, 0xff66ff99, 0xff33ff99, 0xff00ff99, 0xffffcc99,
+    0xffcccc99, 0xff99cc99, 0xff66cc99, 0xff33cc99, 0xff00cc99, 0xffff9999, 0xffcc9999, 0xff999999,
+    0xff669999, 0xff339999, 0xff009999, 0xffff6699, 0xffcc6699, 0xff996699, 0xff666699, 0xff336699,
+    0xff006699, 0xffff3399, 0xffcc3399, 0xff993399, 0xff663399, 0xff333399, 0xff003399, 0xffff0099,
+    0xffcc0099, 0xff990099, 0xff660099, 0xff330099, 0xff000099, 0xffffff66, 0xffccff66, 0xff99ff66,
+    0xff66ff66, 0xff33ff66, 0xff00ff66, 0xffffcc66, 0xffcccc66, 0xff99cc66, 0xff66cc66, 0xff33cc66,
+    0xff00cc66, 0xffff9966, 0xffcc9966, 0xff999966, 0xff669966, 0xff339966, 0xff009966, 0xffff6666,
+    0xffcc6666, 0xff996666, 0xff666666, 0xff336666, 0xff006666, 0xffff3366, 0xffcc3366, 0xff993366,
+    0xff663366, 0xff333366, 0xff003366, 0xffff0066, 0xffcc0066, 0xff990066, 0xff660066, 0xff330066,
+    0xff000066, 0xffffff33, 0xffccff33, 0xff99ff33, 0xff66ff33, 0xff33ff33, 0xff00ff33, 0xffffcc33,
+    0xffcccc33, 0xff99cc33, 0xff66cc33, 0xff33cc33, 0xff00cc33, 0xffff9933, 0xffcc9933, 0xff999933,
+    0xff669933, 0xff339933, 0xff009933, 0xffff6633, 0xffcc6633, 0xff996633, 0xff666633, 0xff336633,
+    0xff006633, 0xffff3333, 0xffcc3333, 0xff993333, 0xff663333, 0xff333333, 0xff003333, 0xffff0033,
+    0xffcc0033, 0xff990033, 0xff660033, 0xff330033, 0xff000033, 0xffffff00, 0xffccff00, 0xff99ff00,
+    0xff66ff00, 0xff33ff00, 0xff00ff00, 0xffffcc00, 0xffcccc00, 0xff99cc00, 0xff66cc00, 0xff33cc00,
+    0xff00cc00, 0xffff9900, 0xffcc9900, 0xff999900, 0xff669900, 0xff339900, 0xff009900, 0xffff6600,
+    0xffcc6600, 0xff996600, 0xff666600, 0xff336600, 0xff006600, 0xffff3300, 0xffcc3300, 0xff993300,
+    0xff663300, 0xff333300, 0xff003300, 0xffff0000, 0xffcc0000, 0xff990000, 0xff660000, 0xff330000,
+    0xff0000ee, 0xff0000dd, 0xff0000bb, 0xff0000aa, 0xff000088, 0xff000077, 0xff000055, 0xff000044,
+    0xff000022, 0xff000011, 0xff00ee00, 0xff00dd00, 0xff00bb00, 0xff00aa00, 0xff008800, 0xff007700,
+    0xff005500, 0xff004400, 0xff002200, 0xff001100, 0xffee0000, 0xffdd0000, 0xffbb0000, 0xffaa0000,
+    0xff880000, 0xff770000, 0xff550000, 0xff440000, 0xff220000, 0xff110000, 0xffeeeeee, 0xffdddddd,
+    0xffbbbbbb, 0xffaaaaaa, 0xff888888, 0xff777777, 0xff555555, 0xff444444, 0xff222222, 0xff111111,
+)
+
 
 class VoxChunk:
     """Represents a chunk in the VOX file format."""
@@ -27,19 +83,23 @@ class VoxChunk:
     
     def to_bytes(self) -> bytes:
         """Convert chunk to binary data."""
+        out = bytearray()
+        self.write_into(out)
+        return bytes(out)
+
+    def write_into(self, out: bytearray):
+        """Append the chunk's binary data to a buffer."""
         # Chunk structure:
         # 4 bytes: chunk id
         # 4 bytes: content size
         # 4 bytes: children size
         # N bytes: content
         # M bytes: children
-        
-        result = self.chunk_id.encode('ascii')
-        result += struct.pack('<I', len(self.content))
-        result += struct.pack('<I', len(self.children))
-        result += self.content
-        result += self.children
-        return result
+
+        out += self.chunk_id.encode('ascii')
+        out += _U32X2.pack(len(self.content), len(self.children))
+        out += self.content
+        out += self.children
 
 
 class VoxModel:
@@ -49,8 +109,24 @@ class VoxModel:
         self.size_x = size_x
         self.size_y = size_y
         self.size_z = size_z
-        self.voxels: List[Tuple[int, int, int, int]] = []  # (x, y, z, color_index)
-    
+        # (x, y, z, color_index) rows, of which the first _num_voxels are used
+        self._voxels = np.empty((16, 4), dtype=np.uint8)
+        self._num_voxels = 0
+
+    @property
+    def voxels(self) -> np.ndarray:
+        """(N, 4) uint8 view of the (x, y, z, color_index) rows added so far."""
+        return self._voxels[:self._num_voxels]
+
+    def _reserve(self, count: int):
+        """Grow the voxel buffer to hold at least count rows."""
+        capacity = len(self._voxels)
+        if count > capacity:
+            # Double so repeated appends stay amortized O(1)
+            grown = np.empty((max(count, capacity * 2), 4), dtype=np.uint8)
+            grown[:self._num_voxels] = self.voxels
+            self._voxels = grown
+
     def add_voxel(self, x: int, y: int, z: int, color_index: int):
         """Add a voxel to the model.
         
@@ -58,23 +134,47 @@ class VoxModel:
             x, y, z: Voxel coordinates (0-255)
             color_index: Palette color index (1-255, 0 is not used)
         """
-        if not (0 <= x < 256 and 0 <= y < 256 and 0 <= z < 256):
+        # Plain comparisons rather than bit tricks, so NumPy unsigned values
+        # (such as rows from the reader) cannot wrap into range
+        if not (0 <= x <= 255 and 0 <= y <= 255 and 0 <= z <= 255):
             raise ValueError(f"Voxel coordinates must be in range 0-255, got ({x}, {y}, {z})")
         if not (1 <= color_index <= 255):
             raise ValueError(f"Color index must be in range 1-255, got {color_index}")
-        
-        self.voxels.append((x, y, z, color_index))
+
+        n = self._num_voxels
+        self._reserve(n + 1)
+        self._voxels[n] = (x, y, z, color_index)
+        self._num_voxels = n + 1
+
+    def add_voxels(self, voxels):
+        """Add many voxels to the model at once.
+
+        Args:
+            voxels: (N, 4) array-like of (x, y, z, color_index) rows, with
+                the same ranges as add_voxel()
+        """
+        voxels = np.asarray(voxels).reshape(-1, 4)
+        if len(voxels) == 0:
+            return
+        if voxels[:, :3].min() < 0 or voxels[:, :3].max() > 255:
+            raise ValueError("Voxel coordinates must be in range 0-255")
+        if voxels[:, 3].min() < 1 or voxels[:, 3].max() > 255:
+            raise ValueError("Color index must be in range 1-255")
+
+        n = self._num_voxels
+        self._reserve(n + len(voxels))
+        self._voxels[n:n + len(voxels)] = voxels
+        self._num_voxels = n + len(voxels)
     
     def get_size_chunk(self) -> VoxChunk:
         """Generate the SIZE chunk for this model."""
-        content = struct.pack('<III', self.size_x, self.size_y, self.size_z)
+        content = _U32X3.pack(self.size_x, self.size_y, self.size_z)
         return VoxChunk('SIZE', content)
     
     def get_xyzi_chunk(self) -> VoxChunk:
         """Generate the XYZI chunk for this model."""
-        content = struct.pack('<I', len(self.voxels))
-        for x, y, z, color_index in self.voxels:
-            content += struct.pack('<BBBB', x, y, z, color_index)
+        # One (x, y, z, color_index) byte row per voxel
+        content = _U32.pack(self._num_voxels) + self.voxels.tobytes()
         return VoxChunk('XYZI', content)
 
 
@@ -82,58 +182,27 @@ class VoxPalette:
     """Represents a color palette for the VOX file."""
     
     def __init__(self):
-        # Initialize with default MagicaVoxel palette
-        self.colors: List[Tuple[int, int, int, int]] = self._get_default_palette()
-    
-    def _get_default_palette(self) -> List[Tuple[int, int, int, int]]:
-        """Get the default MagicaVoxel palette."""
-        # Default palette values from MagicaVoxel specification
-        default = [
-            0x00000000, 0xffffffff, 0xffccffff, 0xff99ffff, 0xff66ffff, 0xff33ffff, 0xff00ffff, 0xffffccff,
-            0xffccccff, 0xff99ccff, 0xff66ccff, 0xff33ccff, 0xff00ccff, 0xffff99ff, 0xffcc99ff, 0xff9999ff,
-            0xff6699ff, 0xff3399ff, 0xff0099ff, 0xffff66ff, 0xffcc66ff, 0xff9966ff, 0xff6666ff, 0xff3366ff,
-            0xff0066ff, 0xffff33ff, 0xffcc33ff, 0xff9933ff, 0xff6633ff, 0xff3333ff, 0xff0033ff, 0xffff00ff,
-            0xffcc00ff, 0xff9900ff, 0xff6600ff, 0xff3300ff, 0xff0000ff, 0xffffffcc, 0xffccffcc, 0xff99ffcc,
-            0xff66ffcc, 0xff33ffcc, 0xff00ffcc, 0xffffcccc, 0xffcccccc, 0xff99cccc, 0xff66cccc, 0xff33cccc,
-            0xff00cccc, 0xffff99cc, 0xffcc99cc, 0xff9999cc, 0xff6699cc, 0xff3399cc, 0xff0099cc, 0xffff66cc,
-            0xffcc66cc, 0xff9966cc, 0xff6666cc, 0xff3366cc, 0xff0066cc, 0xffff33cc, 0xffcc33cc, 0xff9933cc,
-            0xff6633cc, 0xff3333cc, 0xff0033cc, 0xffff00cc, 0xffcc00cc, 0xff9900cc, 0xff6600cc, 0xff3300cc,
-            0xff0000cc, 0xffffff99, 0xffccff99, 0xff99ff99, 0xff66ff99, 0xff33ff99, 0xff00ff99, 0xffffcc99,
-            0xffcccc99, 0xff99cc99, 0xff66cc99, 0xff33cc99, 0xff00cc99, 0xffff9999, 0xffcc9999, 0xff999999,
-            0xff669999, 0xff339999, 0xff009999, 0xffff6699, 0xffcc6699, 0xff996699, 0xff666699, 0xff336699,
-            0xff006699, 0xffff3399, 0xffcc3399, 0xff993399, 0xff663399, 0xff333399, 0xff003399, 0xffff0099,
-            0xffcc0099, 0xff990099, 0xff660099, 0xff330099, 0xff000099, 0xffffff66, 0xffccff66, 0xff99ff66,
-            0xff66ff66, 0xff33ff66, 0xff00ff66, 0xffffcc66, 0xffcccc66, 0xff99cc66, 0xff66cc66, 0xff33cc66,
-            0xff00cc66, 0xffff9966, 0xffcc9966, 0xff999966, 0xff669966, 0xff339966, 0xff009966, 0xffff6666,
-            0xffcc6666, 0xff996666, 0xff666666, 0xff336666, 0xff006666, 0xffff3366, 0xffcc3366, 0xff993366,
-            0xff663366, 0xff333366, 0xff003366, 0xffff0066, 0xffcc0066, 0xff990066, 0xff660066, 0xff330066,
-            0xff000066, 0xffffff33, 0xffccff33, 0xff99ff33, 0xff66ff33, 0xff33ff33, 0xff00ff33, 0xffffcc33,
-            0xffcccc33, 0xff99cc33, 0xff66cc33, 0xff33cc33, 0xff00cc33, 0xffff9933, 0xffcc9933, 0xff999933,
-            0xff669933, 0xff339933, 0xff009933, 0xffff6633, 0xffcc6633, 0xff996633, 0xff666633, 0xff336633,
-            0xff006633, 0xffff3333, 0xffcc3333, 0xff993333, 0xff663333, 0xff333333, 0xff003333, 0xffff0033,
-            0xffcc0033, 0xff990033, 0xff660033, 0xff330033, 0xff000033, 0xffffff00, 0xffccff00, 0xff99ff00,
-            0xff66ff00, 0xff33ff00, 0xff00ff00, 0xffffcc00, 0xffcccc00, 0xff99cc00, 0xff66cc00, 0xff33cc00,
-            0xff00cc00, 0xffff9900, 0xffcc9900, 0xff999900, 0xff669900, 0xff339900, 0xff009900, 0xffff6600,
-            0xffcc6600, 0xff996600, 0xff666600, 0xff336600, 0xff006600, 0xffff3300, 0xffcc3300, 0xff993300,
-            0xff663300, 0xff333300, 0xff003300, 0xffff0000, 0xffcc0000, 0xff990000, 0xff660000, 0xff330000,
-            0xff0000ee, 0xff0000dd, 0xff0000bb, 0xff0000aa, 0xff000088, 0xff000077, 0xff000055, 0xff000044,
-            0xff000022, 0xff000011, 0xff00ee00, 0xff00dd00, 0xff00bb00, 0xff00aa00, 0xff008800, 0xff007700,
-            0xff005500, 0xff004400, 0xff002200, 0xff001100, 0xffee0000, 0xffdd0000, 0xffbb0000, 0xffaa0000,
-            0xff880000, 0xff770000, 0xff550000, 0xff440000, 0xff220000, 0xff110000, 0xffeeeeee, 0xffdddddd,
-            0xffbbbbbb, 0xffaaaaaa, 0xff888888, 0xff777777, 0xff555555, 0xff444444, 0xff222222, 0xff111111,
-        ]
-        
-        colors = []
-        for val in default:
-            # Format is AABBGGRR in the default palette
-            a = (val >> 24) & 0xFF
-            b = (val >> 16) & 0xFF
-            g = (val >> 8) & 0xFF
-            r = val & 0xFF
-            colors.append((r, g, b, a))
-        
-        return colors
+        # Raw RGBA bytes for indices 0-255 followed by the unused entry the
+        # RGBA chunk ends with, initialized with default MagicaVoxel palette
+        self._rgba = bytearray(self._get_default_palette().tobytes() + _RGBA.pack(0, 0, 0, 255))
+        self._colors = np.frombuffer(self._rgba, dtype=np.uint8, count=256 * 4).reshape(256, 4)
+        self._colors.flags.writeable = False
+        self._rgba_cache: Optional[bytes] = None
+
+    @property
+    def colors(self) -> np.ndarray:
+        """Read-only (256, 4) uint8 view of the colors.
+
+        Writes must go through set_color(), which also drops the cached
+        RGBA chunk content.
+        """
+        return self._colors
     
+    def _get_default_palette(self) -> np.ndarray:
+        """Get the default MagicaVoxel palette as a (256, 4) uint8 RGBA array."""
+        # Little-endian AABBGGRR values are R, G, B, A in memory order
+        return np.array(_DEFAULT_PALETTE_HEX, dtype='<u4').view(np.uint8).reshape(-1, 4)
+
     def set_color(self, index: int, r: int, g: int, b: int, a: int = 255):
         """Set a color in the palette.
         
@@ -146,7 +215,8 @@ class VoxPalette:
         
         # Note: palette index 0 is unused, so we store at index-1 effectively
         # But for VOX format compatibility, we keep 256 entries
-        self.colors[index] = (r, g, b, a)
+        _RGBA.pack_into(self._rgba, index * 4, r, g, b, a)
+        self._rgba_cache = None
     
     def get_rgba_chunk(self) -> VoxChunk:
         """Generate the RGBA chunk for this palette.
@@ -158,17 +228,11 @@ class VoxPalette:
         - File position 254 stores color for index 255
         - File position 255 is unused
         """
-        content = b''
-        # Write 256 RGBA values (1024 bytes)
-        for i in range(256):
-            # File position i stores color for index i+1
-            color_idx = i + 1
-            if color_idx < len(self.colors):
-                r, g, b, a = self.colors[color_idx]
-            else:
-                r, g, b, a = 0, 0, 0, 255
-            content += struct.pack('<BBBB', r, g, b, a)
-        return VoxChunk('RGBA', content)
+        if self._rgba_cache is None:
+            # 256 RGBA values (1024 bytes) from index 1 on, ending with the
+            # unused opaque black entry
+            self._rgba_cache = bytes(memoryview(self._rgba)[4:])
+        return VoxChunk('RGBA', self._rgba_cache)
 
 
 @dataclass
@@ -213,13 +277,13 @@ class VoxWriter:
 
     def _build_dict_bytes(self, d: Dict[str, str]) -> bytes:
         """Build binary representation of a VOX dictionary."""
-        result = struct.pack('<I', len(d))
+        result = bytearray(_U32.pack(len(d)))
         for key, val in d.items():
-            result += struct.pack('<I', len(key))
+            result += _U32.pack(len(key))
             result += key.encode('ascii')
-            result += struct.pack('<I', len(val))
+            result += _U32.pack(len(val))
             result += val.encode('ascii')
-        return result
+        return bytes(result)
 
     def _build_scene_graph(self) -> bytes:
         """Build the scene graph chunks (nTRN, nGRP, nSHP).
@@ -230,7 +294,7 @@ class VoxWriter:
         - Node 2, 4, 6, ...: Transform nodes (nTRN) -> point to shape nodes
         - Node 3, 5, 7, ...: Shape nodes (nSHP) -> point to models
         """
-        chunks = b''
+        chunks = bytearray()
 
         # If no instances defined, create default instances at origin
         instances = self.instances
@@ -249,24 +313,21 @@ class VoxWriter:
         root_attrs = {}
         root_frame_attrs = {}  # No transform at root
 
-        content = struct.pack('<I', 0)  # node_id = 0
+        content = _U32.pack(0)  # node_id = 0
         content += self._build_dict_bytes(root_attrs)
-        content += struct.pack('<I', 1)  # child_node_id = 1 (group)
-        content += struct.pack('<I', 0xFFFFFFFF)  # reserved
-        content += struct.pack('<I', 0)  # layer_id
-        content += struct.pack('<I', 1)  # num_frames
+        # child_node_id = 1 (group), reserved, layer_id, num_frames
+        content += _U32X4.pack(1, 0xFFFFFFFF, 0, 1)
         content += self._build_dict_bytes(root_frame_attrs)
-        chunks += VoxChunk('nTRN', content).to_bytes()
+        VoxChunk('nTRN', content).write_into(chunks)
 
         # Group node (node 1) - contains all instance transform nodes
         child_ids = [2 + i * 2 for i in range(num_instances)]
 
-        content = struct.pack('<I', 1)  # node_id = 1
+        content = _U32.pack(1)  # node_id = 1
         content += self._build_dict_bytes({})  # attrs
-        content += struct.pack('<I', num_instances)  # num children
-        for child_id in child_ids:
-            content += struct.pack('<I', child_id)
-        chunks += VoxChunk('nGRP', content).to_bytes()
+        content += _U32.pack(num_instances)  # num children
+        content += b''.join(map(_U32.pack, child_ids))
+        VoxChunk('nGRP', content).write_into(chunks)
 
         # Create transform and shape nodes for each instance
         for i, inst in enumerate(instances):
@@ -284,50 +345,101 @@ class VoxWriter:
             if inst.rotation != 0:
                 frame_attrs['_r'] = str(inst.rotation)
 
-            content = struct.pack('<I', transform_node_id)
+            content = _U32.pack(transform_node_id)
             content += self._build_dict_bytes(trans_attrs)
-            content += struct.pack('<I', shape_node_id)  # child = shape node
-            content += struct.pack('<I', 0xFFFFFFFF)  # reserved
-            content += struct.pack('<I', 0)  # layer_id
-            content += struct.pack('<I', 1)  # num_frames
+            # child = shape node, reserved, layer_id, num_frames
+            content += _U32X4.pack(shape_node_id, 0xFFFFFFFF, 0, 1)
             content += self._build_dict_bytes(frame_attrs)
-            chunks += VoxChunk('nTRN', content).to_bytes()
+            VoxChunk('nTRN', content).write_into(chunks)
 
             # Shape node
-            content = struct.pack('<I', shape_node_id)
+            content = _U32.pack(shape_node_id)
             content += self._build_dict_bytes({})  # attrs
-            content += struct.pack('<I', 1)  # num_models
-            content += struct.pack('<I', inst.model_index)  # model_id
+            content += _U32X2.pack(1, inst.model_index)  # num_models, model_id
             content += self._build_dict_bytes({})  # model attrs
-            chunks += VoxChunk('nSHP', content).to_bytes()
+            VoxChunk('nSHP', content).write_into(chunks)
 
-        return chunks
+        return bytes(chunks)
 
     def write(self, filepath: str):
         """Write the VOX file with scene graph."""
-        with open(filepath, 'wb') as f:
-            # Write header
-            f.write(b'VOX ')
-            f.write(struct.pack('<I', self.VOX_VERSION))
+        # Assemble the whole file in one buffer, leaving room for the file
+        # header (magic, version) and the MAIN chunk header in front
+        data = bytearray(_HEADER.size)
+
+        # Add SIZE and XYZI chunks for each model
+        for model in self.models:
+            model.get_size_chunk().write_into(data)
+            model.get_xyzi_chunk().write_into(data)
+
+        # Add scene graph (nTRN, nGRP, nSHP)
+        if len(self.models) > 0:
+            data += self._build_scene_graph()
+
+        # Add RGBA palette chunk
+        self.palette.get_rgba_chunk().write_into(data)
+
+        # MAIN has no content of its own, everything else is its children
+        _HEADER.pack_into(data, 0, b'VOX ', self.VOX_VERSION,
+                          b'MAIN', 0, len(data) - _HEADER.size)
+
+        # Hand the finished buffer straight to the OS, looping in case it
+        # accepts only part of it at once
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(filepath, flags, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+
+def _nearest_color_index(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """Index of the closest palette color (squared RGB distance) for each color.
+
+    Ties go to the lowest palette index.
+    """
+    colors = np.ascontiguousarray(colors, dtype=np.int64)
+    palette = np.ascontiguousarray(palette, dtype=np.int64)
+    return _nearest_colors(colors, palette)
 
-            # Build children chunks for MAIN
-            children_data = b''
 
-            # Add SIZE and XYZI chunks for each model
-            for model in self.models:
-                children_data += model.get_size_chunk().to_bytes()
-                children_data += model.get_xyzi_chunk().to_bytes()
+def _nearest_colors_numpy(colors: np.ndarray, palette: np.ndarray) -> np.ndarray:
+    """NumPy nearest color search, used when Numba is unavailable."""
+    nearest = np.empty(len(colors), dtype=np.int64)
+    # Batch rows so the distance matrix stays small
+    for start in range(0, len(colors), 4096):
+        diff = colors[start:start + 4096, None, :] - palette[None, :, :]
+        nearest[start:start + 4096] = np.argmin((diff * diff).sum(axis=2), axis=1)
+    return nearest
 
-            # Add scene graph (nTRN, nGRP, nSHP)
-            if len(self.models) > 0:
-                children_data += self._build_scene_graph()
 
-            # Add RGBA palette chunk
-            children_data += self.palette.get_rgba_chunk().to_bytes()
+def _nearest_colors_loop(colors, palette):
+    """Nearest color search written as plain loops for Numba.
 
-            # Write MAIN chunk
-            main_chunk = VoxChunk('MAIN', b'', children_data)
-            f.write(main_chunk.to_bytes())
+    Gives the same result as _nearest_colors_numpy, without the distance matrix.
+    """
+    nearest = np.empty(len(colors), dtype=np.int64)
+    for i in prange(len(colors)):
+        best = 0
+        best_dist = 1 << 62
+        for j in range(len(palette)):
+            dr = colors[i, 0] - palette[j, 0]
+            dg = colors[i, 1] - palette[j, 1]
+            db = colors[i, 2] - palette[j, 2]
+            dist = dr * dr + dg * dg + db * db
+            if dist < best_dist:
+                best_dist = dist
+                best = j
+        nearest[i] = best
+    return nearest
+
+
+if njit is not None:
+    _nearest_colors = njit(cache=True, nogil=True, parallel=True)(_nearest_colors_loop)
+else:
+    _nearest_colors = _nearest_colors_numpy
 
 
 def create_simple_vox(voxels: List[Tuple[int, int, int, Tuple[int, int, int]]], 
@@ -342,44 +454,44 @@ def create_simple_vox(voxels: List[Tuple[int, int, int, Tuple[int, int, int]]],
     """
     if not voxels:
         raise ValueError("No voxels provided")
-    
+
+    # Stream the values straight into one array, without a tuple per voxel
+    rows = np.fromiter(
+        chain.from_iterable((x, y, z, r, g, b) for x, y, z, (r, g, b) in voxels),
+        dtype=np.int64, count=len(voxels) * 6,
+    ).reshape(-1, 6)
+    coords = rows[:, :3]
+    rgb = rows[:, 3:]
+    if rgb.min() < 0 or rgb.max() > 255:
+        raise ValueError("Color components must be in range 0-255")
+
     # Calculate bounding box if size not provided
     if size is None:
-        max_x = max(v[0] for v in voxels) + 1
-        max_y = max(v[1] for v in voxels) + 1
-        max_z = max(v[2] for v in voxels) + 1
-        size = (max_x, max_y, max_z)
-    
-    # Build color palette from voxels
-    color_to_index: Dict[Tuple[int, int, int], int] = {}
-    next_index = 1
-    
+        size = tuple((coords.max(axis=0) + 1).tolist())
+
     writer = VoxWriter()
     model = VoxModel(size[0], size[1], size[2])
-    
-    for x, y, z, color in voxels:
-        r, g, b = color
-        
-        # Get or create palette index for this color
-        color_key = (r, g, b)
-        if color_key not in color_to_index:
-            if next_index > 255:
-                # Find closest existing color
-                best_index = 1
-                best_dist = float('inf')
-                for (cr, cg, cb), idx in color_to_index.items():
-                    dist = (r - cr) ** 2 + (g - cg) ** 2 + (b - cb) ** 2
-                    if dist < best_dist:
-                        best_dist = dist
-                        best_index = idx
-                color_to_index[color_key] = best_index
-            else:
-                color_to_index[color_key] = next_index
-                writer.palette.set_color(next_index, r, g, b, 255)
-                next_index += 1
-        
-        model.add_voxel(x, y, z, color_to_index[color_key])
-    
+
+    # Build color palette from voxels, giving indices 1-255 to the unique
+    # colors in order of first appearance
+    keys = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    color_index = np.empty(len(first), dtype=np.int64)
+    color_index[order] = np.arange(1, len(first) + 1)
+
+    palette_rgb = rgb[first[order[:255]]]
+    set_color = writer.palette.set_color
+    for index, (r, g, b) in enumerate(palette_rgb.tolist(), start=1):
+        set_color(index, r, g, b, 255)
+
+    # Any further colors use the closest palette color
+    overflow = color_index > 255
+    if overflow.any():
+        color_index[overflow] = _nearest_color_index(rgb[first[overflow]], palette_rgb) + 1
+
+    model.add_voxels(np.column_stack((coords, color_index[inverse.ravel()])))
+
     writer.add_model(model)
     writer.write(filepath)
 